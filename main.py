@@ -1,5 +1,7 @@
+import argparse
 import os
 from src.cb_parser3 import CodebaseParser
+from src.profiling import IngestProfiler
 
 # Define your custom ignore list
 custom_ignore_list = [
@@ -35,13 +37,31 @@ def recursive_search(path, parser):
             # Recursively search inside the directory
             recursive_search(full_path, parser)
 
-# Example Usage:
-path = "/Users/astraeus/bitgraph"  # Update with your base path
-parser = CodebaseParser("neo4j://localhost:7687", "neo4j", "mypassword")
+def main():
+    arg_parser = argparse.ArgumentParser(description="Index a codebase into the Bitgraph graph store.")
+    arg_parser.add_argument("path", nargs="?", default=".", help="codebase to index (default: current directory)")
+    arg_parser.add_argument("--profile", metavar="DIR",
+                            help="profile the ingest and write per-file cost reports to DIR")
+    arg_parser.add_argument("--profile-top", type=int, default=20, metavar="N",
+                            help="number of slowest files and queries to report (default: 20)")
+    args = arg_parser.parse_args()
 
-# clear the database
-parser.driver.session().run("MATCH (n) DETACH DELETE n")
+    parser = CodebaseParser("neo4j://localhost:7687", "neo4j", "mypassword")
 
-# Start recursive search with custom filtering
-parser.populate_codebase(path)
-parser.parse_codebase(path)
+    # clear the database
+    parser.driver.session().run("MATCH (n) DETACH DELETE n")
+
+    if not args.profile:
+        parser.populate_codebase(args.path)
+        parser.parse_codebase(args.path)
+        return
+
+    parser.profiler = IngestProfiler(args.profile, top_n=args.profile_top)
+    with parser.profiler.run():
+        parser.populate_codebase(args.path)
+        parser.parse_codebase(args.path)
+    print(f"Profile report written to {parser.profiler.write_report()}")
+
+
+if __name__ == "__main__":
+    main()
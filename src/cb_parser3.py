@@ -1,12 +1,50 @@
 import ast
 import os
-from neo4j import GraphDatabase
 from src.enums import NodeType, EdgeType
+from src.graph_diff import SnapshotCache, diff_facts, apply_delta, read_snapshot_from_store, ensure_file_indexes
+from src.extraction import FileFacts
+from src.graph_export import GraphExporter, iter_store_records
+from src.context_pack import SourceReader, context_pack_from_store, ensure_context_indexes
+from src.symbol_index import SymbolIndex
+from src.journal import WriteJournal, JournalReplayer
+from src.parallel_writer import ParallelGraphWriter
+from src.metrics import compute_fan_metrics, ensure_metric_indexes
+from src.class_hierarchy import ClassHierarchy, module_name_for
+from src.graph_query import GraphQuery
+from src.profiling import NullProfiler
+from src.import_graph import ModuleGraph
+from src.source_loader import SourceLoader, SourceError
 
 class CodebaseParser:
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str) -> None:
-        # Initialize Neo4j driver
-        self.driver = GraphDatabase.driver(uri=neo4j_uri, auth=(neo4j_user, neo4j_password))
+    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str, snapshot_dir: str=None,
+                 journal_dir: str=None) -> None:
+        # Initialize Neo4j driver; the package is slow to import, so only parsers load it
+        from neo4j import GraphDatabase
+        self.store_driver = GraphDatabase.driver(uri=neo4j_uri, auth=(neo4j_user, neo4j_password))
+        # With a journal, writes are appended to it and replayed into the store later.
+        # Previous fact sets then come from snapshots, since the store cannot be read.
+        if journal_dir and not snapshot_dir:
+            raise ValueError("A journal_dir needs a snapshot_dir to diff files against")
+        self.journal = WriteJournal(journal_dir) if journal_dir else None
+        self.driver = self.journal if self.journal else self.store_driver
+        # Streaming, cursor-paginated read access to the store
+        self.graph_query = GraphQuery(self.store_driver)
+        # Replaced by an IngestProfiler in profile mode
+        self.profiler = NullProfiler()
+        # Optional cache of the last applied fact set per file, used by sync_file
+        self.snapshots = SnapshotCache(snapshot_dir) if snapshot_dir else None
+        self.source_reader = SourceReader()
+        # Symbol search index, persisted next to the snapshots when there are any
+        self.symbol_index_path = os.path.join(snapshot_dir, "symbols.json") if snapshot_dir else None
+        self.symbol_index = SymbolIndex.load(self.symbol_index_path) if snapshot_dir else SymbolIndex()
+        # Cross-module class hierarchy; module names are relative to codebase_root
+        self.class_hierarchy = ClassHierarchy()
+        self.hierarchy_changes: set = set()
+        # Module dependency graph built from the extracted imports
+        self.module_graph = ModuleGraph()
+        self.codebase_root = ""
+        # Bounded, fault-tolerant reading and parsing of source files
+        self.loader = SourceLoader()
         # Define a custom ignore list for directories and files
         self.custom_ignore_list = [
             "__pycache__",
@@ -55,10 +93,12 @@ class CodebaseParser:
         Parses the codebase and populates the graph database with relationships between different entities.
         """
         with self.driver.session() as session:
+            session = self.profiler.wrap_session(session)
             for root, _, files in os.walk(codebase_path):
                 for file_name in files:
                     file_path = os.path.join(root, file_name)
                     self.parse_file(session, file_path)
+        self.loader.close()
 
     def parse_file(self, session, file_path: str) -> None:
         """
@@ -66,11 +106,197 @@ class CodebaseParser:
         """
         if not file_path.endswith(".py"):
             return
-        with open(file_path, 'r') as f:
-            code: str = f.read()
+        with self.profiler.file(file_path):
+            with self.profiler.stage("parse"):
+                try:
+                    _, tree = self.loader.read_and_parse(file_path)
+                except SourceError as e:
+                    # Keep the file in the graph, annotated with why it was not parsed
+                    session.run(
+                        "MERGE (file:File {path: $path}) "
+                        "SET file.load_status = $status, file.load_error = $reason",
+                        path=file_path, status=e.status, reason=e.reason
+                    )
+                    return
+            with self.profiler.stage("process"):
+                self.process_tree(session, tree, file_path)
+
+    def sync_codebase(self, codebase_path: str) -> int:
+        """
+        Re-extracts every Python file in the codebase and writes only what changed.
+        Files that no longer exist are removed from the graph.
+        Returns the number of graph changes applied.
+        """
+        changes = 0
+        self.codebase_root = codebase_path
+        file_paths = self.python_files(codebase_path)
+        with self.driver.session() as session:
+            session = self.profiler.wrap_session(session)
+            for file_path in sorted(self.indexed_files(session, codebase_path) - set(file_paths)):
+                changes += self.remove_file(session, file_path)
+            for facts in self.loader.load_many(file_paths):
+                changes += self.sync_file(session, facts.file_path, facts)
+            if changes:
+                compute_fan_metrics(session)
+            self.materialize_class_hierarchy(session)
+            self.module_graph.persist(session)
+        if self.journal is None:
+            # Schema statements are not journaled; replay_journal creates them instead
+            self.ensure_indexes()
+        if self.symbol_index_path:
+            self.symbol_index.save(self.symbol_index_path)
+        return changes
+
+    def ensure_indexes(self) -> None:
+        """
+        Creates the store indexes that lookups and metric queries rely on.
+        """
+        with self.store_driver.session() as session:
+            ensure_metric_indexes(session)
+            ensure_file_indexes(session)
+            ensure_context_indexes(session)
+
+    def parallel_index(self, codebase_path: str, writers: int=4) -> dict:
+        """
+        Extracts every Python file in the codebase and writes the graph with
+        `writers` concurrent writers. Shared module and directory nodes are
+        created up front so the writers never contend for the same node.
+        """
+        facts_list = list(self.loader.load_many(self.python_files(codebase_path)))
+        counts = ParallelGraphWriter(self.store_driver, writers).write(facts_list)
+        for facts in facts_list:
+            self.symbol_index.update_file(facts)
+            module_name, is_package = module_name_for(facts.file_path, codebase_path)
+            self.class_hierarchy.update_file(facts, module_name, is_package)
+            self.module_graph.update_file(facts, module_name, is_package)
+        self.ensure_indexes()
+        with self.store_driver.session() as session:
+            compute_fan_metrics(session)
+            self.class_hierarchy.materialize(session)
+            self.module_graph.persist(session)
+        if self.symbol_index_path:
+            self.symbol_index.save(self.symbol_index_path)
+        return counts
+
+    def python_files(self, codebase_path: str) -> list:
+        file_paths = []
+        for root, _, files in os.walk(codebase_path):
+            for file_name in files:
+                file_path = os.path.join(root, file_name)
+                if file_name.endswith(".py") and not self.should_ignore(file_path):
+                    file_paths.append(file_path)
+        return file_paths
+
+    def sync_file(self, session, file_path: str, facts=None) -> int:
+        """
+        Diffs a file's freshly extracted facts against its previous snapshot and
+        applies only the delta. The snapshot comes from the cache when one is
+        configured, otherwise it is read back from the store. Files are parsed
+        here unless already loaded `facts` are passed in.
+        Returns the number of graph changes applied.
+        """
+        with self.profiler.file(file_path):
+            if facts is None:
+                # Parsed and extracted in the loader's worker, within its timeout
+                with self.profiler.stage("parse"):
+                    facts = self.loader.load(file_path)
+            with self.profiler.stage("diff"):
+                previous = self.snapshots.load(file_path) if self.snapshots else None
+                if previous is None:
+                    previous = read_snapshot_from_store(session, file_path)
+                delta = diff_facts(previous, facts)
+            with self.profiler.stage("write"):
+                if not delta.is_empty():
+                    apply_delta(session, delta)
+                if self.snapshots:
+                    self.snapshots.save(facts)
+            with self.profiler.stage("index"):
+                self.symbol_index.update_file(facts)
+                module_name, is_package = module_name_for(file_path, self.codebase_root)
+                self.hierarchy_changes |= self.class_hierarchy.update_file(facts, module_name, is_package)
+                self.module_graph.update_file(facts, module_name, is_package)
+        return len(delta)
+
+    def indexed_files(self, session, codebase_path: str) -> set:
+        """
+        Returns the Python files under `codebase_path` that the graph holds.
+        """
+        prefix = os.path.join(codebase_path, "")
+        if self.journal is not None:
+            # The store cannot be read while journaling; the snapshots record what was written
+            file_paths = self.snapshots.file_paths()
+        else:
+            result = session.run(
+                "MATCH (file:File) WHERE file.path STARTS WITH $prefix RETURN file.path AS path",
+                prefix=prefix
+            )
+            file_paths = [record["path"] for record in result]
+        return {file_path for file_path in file_paths
+                if file_path.startswith(prefix) and file_path.endswith(".py") and not self.should_ignore(file_path)}
+
+    def remove_file(self, session, file_path: str) -> int:
+        """
+        Deletes a file that no longer exists, with everything it owns, from the
+        graph, the snapshot cache and the in-memory indexes.
+        Returns the number of graph changes applied.
+        """
+        with self.profiler.file(file_path):
+            previous = self.snapshots.load(file_path) if self.snapshots else None
+            if previous is None:
+                previous = read_snapshot_from_store(session, file_path)
+            delta = diff_facts(previous, FileFacts(file_path))
+            if not delta.is_empty():
+                apply_delta(session, delta)
+            if self.snapshots:
+                self.snapshots.discard(file_path)
+            self.symbol_index.remove_file(file_path)
+            module_name, is_package = module_name_for(file_path, self.codebase_root)
+            self.hierarchy_changes |= self.class_hierarchy.update_file(FileFacts(file_path), module_name, is_package)
+            if self.module_graph.files.get(module_name) == file_path:
+                self.module_graph.remove_module(module_name)
+        return len(delta)
+
+    def materialize_class_hierarchy(self, session) -> None:
+        """
+        Writes the MROs and SUBCLASS_OF edges of every class changed since the
+        last call.
+        """
+        self.class_hierarchy.materialize(session, self.hierarchy_changes)
+        self.hierarchy_changes = set()
+
+    def replay_journal(self, batch_size: int=5000) -> dict:
+        """
+        Seals the current journal segment and streams every sealed segment into
+        the store. Returns replay statistics.
+        """
+        if self.journal is None:
+            raise ValueError("CodebaseParser was created without a journal_dir")
+        self.journal.close()
+        stats = JournalReplayer(self.journal.journal_dir, batch_size).replay(self.store_driver)
+        self.ensure_indexes()
+        return stats
+
+    def search_symbols(self, query: str, limit: int=10) -> list:
+        """
+        Finds functions, classes and variables by partial or misspelled name.
+        """
+        return self.symbol_index.search(query, limit)
+
+    def export_graph(self, output_dir: str, export_format: str="jsonl", chunk_size: int=50000) -> dict:
+        """
+        Streams the stored graph into chunked export files and returns the manifest.
+        """
+        with self.store_driver.session() as session:
+            exporter = GraphExporter(output_dir, export_format, chunk_size)
+            return exporter.export(iter_store_records(session, page_size=chunk_size))
 
-        tree: ast.AST = ast.parse(code, filename=file_path)
-        self.process_tree(session, tree, file_path)
+    def context_pack(self, symbol: str, hops: int=1) -> list:
+        """
+        Returns the k-hop neighbourhood of a symbol with its source snippets,
+        ready to be assembled into a prompt.
+        """
+        with self.store_driver.session() as session:
+            return context_pack_from_store(session, symbol, hops, self.source_reader)
 
     def should_ignore(self, path):
         """
@@ -0,0 +1,304 @@
+import os
+
+# Properties and relationships materialize() writes onto Class nodes; they are not part of the extracted facts
+HIERARCHY_PROPERTIES = ("class_id", "mro", "ancestors", "descendants")
+HIERARCHY_RELATIONSHIPS = ("SUBCLASS_OF",)
+
+
+def module_name_for(file_path: str, root: str="") -> tuple:
+    """
+    Returns (dotted module name, is_package) for a Python file under `root`.
+    """
+    relative = os.path.relpath(file_path, root) if root else file_path
+    parts = os.path.splitext(os.path.normpath(relative))[0].split(os.sep)
+    parts = [part for part in parts if part not in ("", ".")]
+    if parts and parts[-1] == "__init__":
+        return ".".join(parts[:-1]), True
+    return ".".join(parts), False
+
+
+def resolve_relative(target: str, module_name: str, is_package: bool) -> str:
+    """
+    Turns a relative import target such as "..base.Base" into an absolute one.
+    """
+    level = len(target) - len(target.lstrip("."))
+    if level == 0:
+        return target
+    package = module_name.split(".") if module_name else []
+    if not is_package:
+        package = package[:-1]
+    if level > 1:
+        package = package[:len(package) - (level - 1)]
+    rest = target[level:]
+    return ".".join(package + ([rest] if rest else []))
+
+
+def discard_from(index: dict, key: str, value: str) -> None:
+    """
+    Removes `value` from the set at `index[key]`, dropping the set once empty.
+    """
+    values = index.get(key)
+    if values is not None:
+        values.discard(value)
+        if not values:
+            del index[key]
+
+
+class C3Error(Exception):
+    pass
+
+
+def c3_merge(sequences: list) -> list:
+    """
+    Merges linearizations following the C3 algorithm used for Python's MRO.
+    """
+    sequences = [list(sequence) for sequence in sequences if sequence]
+    result = []
+    while sequences:
+        for sequence in sequences:
+            head = sequence[0]
+            if not any(head in other[1:] for other in sequences):
+                break
+        else:
+            raise C3Error("Cannot create a consistent method resolution order")
+        result.append(head)
+        for sequence in sequences:
+            if sequence[0] == head:
+                del sequence[0]
+        sequences = [sequence for sequence in sequences if sequence]
+    return result
+
+
+class ClassHierarchy:
+    """
+    Cross-module class hierarchy with materialized C3 MROs, ancestor and
+    descendant sets and a method resolution table.
+
+    Classes are identified by "<module>.<qualname>". Bases that cannot be
+    resolved to a class in the codebase (builtins, third-party classes) are
+    kept in MROs under their dotted name.
+    """
+
+    def __init__(self) -> None:
+        # class id -> {"key", "bases", "methods", "module", "aliases", "is_package"}
+        self.classes: dict = {}
+        self.file_classes: dict = {}
+        self.by_name: dict = {}
+        self.resolved_bases: dict = {}
+        # resolved base id -> classes listing it as a base, and last component of
+        # a base expression -> classes using it, both kept up to date incrementally
+        self.children: dict = {}
+        self.base_name_users: dict = {}
+        self.mro: dict = {}
+        self.ancestors: dict = {}
+        self.descendants: dict = {}
+        self.method_table: dict = {}
+        self.inconsistent: set = set()
+
+    def update_file(self, facts, module_name: str, is_package: bool=False) -> set:
+        """
+        Replaces the classes of one file and recomputes only what they affect.
+        Returns the ids of the classes whose hierarchy data changed, including
+        ancestors whose descendant sets shrank or grew.
+        """
+        old_ids = self.file_classes.pop(facts.file_path, set())
+        affected = set(old_ids)
+        # Ancestors of removed classes lose descendants even if nothing else changes
+        former_ancestors = set()
+        for class_id in old_ids:
+            affected |= self.descendants.get(class_id, set())
+            former_ancestors |= self.ancestors.get(class_id, set())
+            self.remove_class(class_id)
+
+        aliases = dict(entry.split("=", 1) for entry in
+                       facts.nodes.get(("File", facts.file_path, facts.file_path), {}).get("import_aliases", []))
+        methods: dict = {}
+        for key, props in facts.nodes.items():
+            if key[0] == "Function" and "." in key[1]:
+                owner, _, method = key[1].rpartition(".")
+                methods.setdefault(owner, {})[method] = key
+
+        new_ids = set()
+        for key, props in facts.nodes.items():
+            if key[0] != "Class":
+                continue
+            class_id = f"{module_name}.{key[1]}" if module_name else key[1]
+            self.classes[class_id] = {
+                "key": key, "bases": props.get("bases", []), "methods": methods.get(key[1], {}),
+                "module": module_name, "aliases": aliases, "is_package": is_package,
+            }
+            self.by_name.setdefault(props.get("name", key[1].rpartition(".")[2]), set()).add(class_id)
+            for base in self.classes[class_id]["bases"]:
+                self.base_name_users.setdefault(base.rpartition(".")[2], set()).add(class_id)
+            new_ids.add(class_id)
+        self.file_classes[facts.file_path] = new_ids
+        affected |= new_ids
+
+        # Classes elsewhere whose bases may now resolve differently
+        for name in {class_id.rpartition(".")[2] for class_id in old_ids | new_ids}:
+            affected |= self.base_name_users.get(name, set())
+
+        for class_id in affected:
+            if class_id in self.classes:
+                self.set_resolved_bases(class_id, [self.resolve_base(class_id, base)
+                                                   for base in self.classes[class_id]["bases"]])
+        return self.recompute(affected) | {class_id for class_id in former_ancestors if class_id in self.classes}
+
+    def set_resolved_bases(self, class_id: str, bases: list) -> None:
+        for base in self.resolved_bases.get(class_id, ()):
+            discard_from(self.children, base, class_id)
+        self.resolved_bases[class_id] = bases
+        for base in bases:
+            self.children.setdefault(base, set()).add(class_id)
+
+    def remove_class(self, class_id: str) -> None:
+        info = self.classes.pop(class_id, None)
+        if info is None:
+            return
+        name = info["key"][1].rpartition(".")[2]
+        self.by_name.get(name, set()).discard(class_id)
+        for base in info["bases"]:
+            discard_from(self.base_name_users, base.rpartition(".")[2], class_id)
+        for base in self.resolved_bases.get(class_id, ()):
+            discard_from(self.children, base, class_id)
+        for table in (self.resolved_bases, self.mro, self.method_table):
+            table.pop(class_id, None)
+        for ancestor in self.ancestors.pop(class_id, set()):
+            self.descendants.get(ancestor, set()).discard(class_id)
+        self.descendants.pop(class_id, None)
+        self.inconsistent.discard(class_id)
+
+    def resolve_base(self, class_id: str, base: str) -> str:
+        """
+        Resolves a base class expression to a class id, or returns it unchanged
+        when it does not name a class in the codebase.
+        """
+        info = self.classes[class_id]
+        module_name = info["module"]
+        head, _, rest = base.partition(".")
+
+        candidates = []
+        if head in info["aliases"]:
+            target = resolve_relative(info["aliases"][head], module_name, info["is_package"])
+            candidates.append(f"{target}.{rest}" if rest else target)
+        # A class of the same module, then a nested class of the same enclosing scope
+        candidates.append(f"{module_name}.{base}" if module_name else base)
+        scope = class_id.rpartition(".")[0]
+        if scope and scope != module_name:
+            candidates.append(f"{scope}.{base}")
+        for candidate in candidates:
+            if candidate in self.classes and candidate != class_id:
+                return candidate
+
+        # Re-exports (from .models import Base in a package __init__) and star
+        # imports: fall back to a class with that name if it is unambiguous
+        matches = self.by_name.get(base.rpartition(".")[2], set()) - {class_id}
+        if len(matches) == 1:
+            return next(iter(matches))
+        return base
+
+    def recompute(self, affected: set) -> set:
+        """
+        Recomputes MROs, ancestors and method tables of `affected` and all
+        their descendants. Returns the ids that were recomputed, plus their
+        old and new ancestors, whose descendant sets may have changed.
+        """
+        stale = set()
+        stack = [class_id for class_id in affected if class_id in self.classes]
+        while stack:
+            class_id = stack.pop()
+            if class_id in stale:
+                continue
+            stale.add(class_id)
+            stack.extend(self.children.get(class_id, ()))
+
+        # Ancestors gained or lost by a stale class change their descendant sets
+        changed = set(stale)
+        for class_id in stale:
+            self.mro.pop(class_id, None)
+            for ancestor in self.ancestors.pop(class_id, set()):
+                self.descendants.get(ancestor, set()).discard(class_id)
+                changed.add(ancestor)
+        for class_id in stale:
+            self.linearize(class_id, set())
+        for class_id in stale:
+            ancestors = {ancestor for ancestor in self.mro[class_id][1:] if ancestor in self.classes}
+            self.ancestors[class_id] = ancestors
+            for ancestor in ancestors:
+                self.descendants.setdefault(ancestor, set()).add(class_id)
+            table = {}
+            for owner in reversed(self.mro[class_id]):
+                if owner in self.classes:
+                    for method in self.classes[owner]["methods"]:
+                        table[method] = owner
+            self.method_table[class_id] = table
+            changed |= ancestors
+        return {class_id for class_id in changed if class_id in self.classes}
+
+    def linearize(self, class_id: str, visiting: set) -> list:
+        if class_id in self.mro:
+            return self.mro[class_id]
+        if class_id not in self.classes or class_id in visiting:
+            # External classes and inheritance cycles linearize to themselves
+            return [class_id]
+        visiting.add(class_id)
+        bases = self.resolved_bases.get(class_id, [])
+        base_mros = [self.linearize(base, visiting) for base in bases]
+        visiting.discard(class_id)
+        try:
+            mro = [class_id] + c3_merge(base_mros + [bases])
+            self.inconsistent.discard(class_id)
+        except C3Error:
+            # Python would reject this class; keep a depth-first order so lookups still work
+            self.inconsistent.add(class_id)
+            mro = [class_id]
+            for base_mro in base_mros:
+                mro.extend(entry for entry in base_mro if entry not in mro)
+        self.mro[class_id] = mro
+        return mro
+
+    def resolve_method(self, class_id: str, method: str):
+        """
+        Returns the id of the class whose definition of `method` is used by
+        `class_id`, or None when no class in the codebase defines it.
+        """
+        return self.method_table.get(class_id, {}).get(method)
+
+    def subclasses(self, class_id: str) -> set:
+        return set(self.descendants.get(class_id, set()))
+
+    def materialize(self, session, class_ids=None) -> None:
+        """
+        Writes MROs and ancestor/descendant sets onto Class nodes and replaces
+        their transitive SUBCLASS_OF edges, for all classes or only `class_ids`.
+        """
+        class_ids = set(self.classes) if class_ids is None else class_ids & set(self.classes)
+        rows = []
+        for class_id in sorted(class_ids):
+            qualname, file_path = self.classes[class_id]["key"][1:]
+            ancestors = [
+                {"qualname": self.classes[a]["key"][1], "file": self.classes[a]["key"][2], "mro_index": index}
+                for index, a in enumerate(self.mro[class_id]) if a in self.ancestors[class_id]
+            ]
+            rows.append({
+                "qualname": qualname, "file": file_path, "class_id": class_id,
+                "mro": self.mro[class_id],
+                "ancestors": sorted(self.ancestors[class_id]),
+                "descendants": sorted(self.descendants.get(class_id, set())),
+                "targets": ancestors,
+            })
+        if not rows:
+            return
+        session.run(
+            "UNWIND $rows AS row "
+            "MATCH (class:Class {qualname: row.qualname, file: row.file}) "
+            "SET class.class_id = row.class_id, class.mro = row.mro, "
+            "class.ancestors = row.ancestors, class.descendants = row.descendants "
+            "WITH class, row "
+            "OPTIONAL MATCH (class)-[old:SUBCLASS_OF]->() DELETE old "
+            "WITH DISTINCT class, row "
+            "UNWIND row.targets AS target "
+            "MATCH (ancestor:Class {qualname: target.qualname, file: target.file}) "
+            "MERGE (class)-[edge:SUBCLASS_OF]->(ancestor) SET edge.mro_index = target.mro_index",
+            rows=rows
+        )
@@ -0,0 +1,235 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+# Only the standard library is imported here. Commands import the modules
+# they need when they run, so `bitgraph query` never loads the Neo4j driver.
+
+CONFIG_FILE = ".bitgraph.json"
+DEFAULT_CONFIG = {
+    "backend": "sqlite",
+    "db": os.path.join(".bitgraph", "graph.db"),
+    "neo4j_uri": "neo4j://localhost:7687",
+    "neo4j_user": "neo4j",
+    "neo4j_password": "",
+    "snapshot_dir": None,
+    "writers": 4,
+    "max_bytes": 2 * 1024 * 1024,
+    "max_lines": 50000,
+    "parse_timeout": 10.0,
+    "parse_workers": None,
+    "ignore": ["__pycache__", "venv", ".git", ".bitgraph", "neo4j"],
+}
+
+
+def load_config(args) -> dict:
+    """
+    Builds the configuration from the defaults, then the config file (the
+    --config path, or .bitgraph.json in the working directory), then flags.
+    """
+    config = dict(DEFAULT_CONFIG)
+    config_path = args.config or (CONFIG_FILE if os.path.isfile(CONFIG_FILE) else None)
+    if config_path:
+        with open(config_path, 'r', encoding="utf-8") as f:
+            values = json.load(f)
+        unknown = set(values) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise SystemExit(f"{config_path}: unknown settings {', '.join(sorted(unknown))}")
+        config.update(values)
+    for name in DEFAULT_CONFIG:
+        value = getattr(args, name, None)
+        if value is not None:
+            config[name] = value
+    return config
+
+
+def iter_python_files(codebase_path: str, ignore: list):
+    for root, dirs, files in os.walk(codebase_path):
+        dirs[:] = sorted(d for d in dirs if not any(entry in os.path.join(root, d) for entry in ignore))
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            if file_name.endswith(".py") and not any(entry in file_path for entry in ignore):
+                yield file_path
+
+
+def open_store(config: dict, create: bool=False):
+    from src.sqlite_store import SQLiteGraphStore
+    if not create and not os.path.isfile(config["db"]):
+        raise SystemExit(f"No index at {config['db']}; run `bitgraph index` first")
+    if create:
+        os.makedirs(os.path.dirname(os.path.abspath(config["db"])), exist_ok=True)
+    return SQLiteGraphStore(config["db"])
+
+
+def open_parser(config: dict):
+    from src.cb_parser3 import CodebaseParser
+    parser = CodebaseParser(config["neo4j_uri"], config["neo4j_user"], config["neo4j_password"],
+                            snapshot_dir=config["snapshot_dir"])
+    parser.custom_ignore_list = config["ignore"]
+    parser.loader = open_loader(config)
+    return parser
+
+
+def open_loader(config: dict):
+    from src.source_loader import SourceLoader
+    return SourceLoader(config["max_bytes"], config["max_lines"], config["parse_timeout"], config["parse_workers"])
+
+
+def open_profiler(args):
+    if not getattr(args, "profile", None):
+        return None
+    from src.profiling import IngestProfiler
+    return IngestProfiler(args.profile, top_n=args.profile_top)
+
+
+def index_sqlite(config: dict, codebase_path: str, only_changed: bool, profiler=None) -> dict:
+    with open_store(config, create=True) as store:
+        file_paths = list(iter_python_files(codebase_path, config["ignore"]))
+        removed = sorted(set(store.indexed_files()) - set(file_paths))
+        for file_path in removed:
+            store.remove_file(file_path)
+        if only_changed:
+            file_paths = store.changed_files(file_paths)
+        skipped = []
+
+        def loaded():
+            loader = open_loader(config)
+            if profiler is None:
+                yield from loader.load_many(file_paths)
+                return
+            # One file at a time, so each parse and write is attributed to its file
+            for file_path in file_paths:
+                with profiler.file(file_path):
+                    with profiler.stage("parse"):
+                        facts = loader.load(file_path)
+                    with profiler.stage("write"):
+                        yield facts
+
+        def load():
+            for facts in loaded():
+                status = facts.nodes[("File", facts.file_path, facts.file_path)].get("load_status")
+                if status:
+                    skipped.append(facts.file_path)
+                yield facts
+
+        written = store.load(load())
+        store.remove_orphan_shared_nodes()
+        return {"files": written, "removed": len(removed), "not_parsed": len(skipped), **store.counts()}
+
+
+def run_ingest(args, config: dict, only_changed: bool) -> dict:
+    profiler = open_profiler(args)
+    with profiler.run() if profiler else contextlib.nullcontext():
+        if config["backend"] == "neo4j":
+            parser = open_parser(config)
+            if profiler:
+                parser.profiler = profiler
+            if only_changed:
+                counts = {"changes": parser.sync_codebase(args.path)}
+            else:
+                counts = parser.parallel_index(args.path, config["writers"])
+        else:
+            counts = index_sqlite(config, args.path, only_changed, profiler)
+    if profiler:
+        print(f"Profile report written to {profiler.write_report()}", file=sys.stderr)
+    return counts
+
+
+def cmd_index(args, config: dict) -> None:
+    print(json.dumps(run_ingest(args, config, only_changed=False)))
+
+
+def cmd_update(args, config: dict) -> None:
+    print(json.dumps(run_ingest(args, config, only_changed=True)))
+
+
+def cmd_query(args, config: dict) -> None:
+    if config["backend"] != "sqlite":
+        raise SystemExit(f"`bitgraph query` reads the local SQLite index only; "
+                         f"the {config['backend']} backend cannot be queried from the command line")
+    with open_store(config) as store:
+        if args.kind == "importers":
+            results = [{"file": file_path} for file_path in store.importers(args.name)]
+        elif args.kind == "find":
+            results = store.find(args.name, args.label)
+        else:
+            results = getattr(store, args.kind)(args.name, args.depth)
+    if args.json:
+        print(json.dumps(results))
+        return
+    for entry in results:
+        location = f"{entry['file']}:{entry['lineno']}" if "lineno" in entry else entry["file"]
+        prefix = "  " * (entry.get("depth", 1) - 1)
+        print(f"{prefix}{entry['qualname']}  {location}" if "qualname" in entry else location)
+
+
+def cmd_export(args, config: dict) -> None:
+    if config["backend"] == "neo4j":
+        manifest = open_parser(config).export_graph(args.output, args.format, args.chunk_size)
+    else:
+        from src.graph_export import GraphExporter
+        with open_store(config) as store:
+            manifest = GraphExporter(args.output, args.format, args.chunk_size).export(store.iter_records())
+    print(f"Exported {manifest['nodes']} nodes and {manifest['edges']} edges to {args.output}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bitgraph", description="Graph the relationships within a codebase.")
+    parser.add_argument("--config", metavar="FILE", help=f"JSON config file (default: ./{CONFIG_FILE} if present)")
+    parser.add_argument("--backend", choices=("sqlite", "neo4j"), help="graph store (default: sqlite)")
+    parser.add_argument("--db", metavar="PATH", help="SQLite database file (default: .bitgraph/graph.db)")
+    parser.add_argument("--neo4j-uri", dest="neo4j_uri", metavar="URI")
+    parser.add_argument("--neo4j-user", dest="neo4j_user", metavar="USER")
+    parser.add_argument("--neo4j-password", dest="neo4j_password", metavar="PASSWORD")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index = commands.add_parser("index", help="index a codebase from scratch")
+    index.add_argument("path", nargs="?", default=".", help="codebase to index (default: current directory)")
+    index.add_argument("--writers", type=int, help="concurrent Neo4j writers (default: 4)")
+    index.set_defaults(handler=cmd_index)
+
+    update = commands.add_parser("update", help="re-index only the files that changed")
+    update.add_argument("path", nargs="?", default=".", help="codebase to update (default: current directory)")
+    update.add_argument("--snapshot-dir", dest="snapshot_dir", metavar="DIR",
+                        help="snapshot cache used by the Neo4j backend")
+    update.set_defaults(handler=cmd_update)
+
+    for command in (index, update):
+        command.add_argument("--max-bytes", dest="max_bytes", type=int, metavar="N",
+                             help="skip files larger than N bytes (default: 2 MiB)")
+        command.add_argument("--max-lines", dest="max_lines", type=int, metavar="N",
+                             help="skip files with more than N lines (default: 50000)")
+        command.add_argument("--parse-timeout", dest="parse_timeout", type=float, metavar="SECONDS",
+                             help="give up on a file after SECONDS (default: 10)")
+        command.add_argument("--parse-workers", dest="parse_workers", type=int, metavar="N",
+                             help="parser processes (default: CPU count)")
+        command.add_argument("--profile", metavar="DIR",
+                             help="profile the ingest and write per-file cost reports to DIR")
+        command.add_argument("--profile-top", dest="profile_top", type=int, default=20, metavar="N",
+                             help="slowest files listed in the profile report (default: 20)")
+
+    query = commands.add_parser("query", help="query the local index")
+    query.add_argument("kind", choices=("callers", "callees", "importers", "find"))
+    query.add_argument("name", help="function, module or symbol name")
+    query.add_argument("--depth", type=int, default=1, help="call hops to follow (default: 1)")
+    query.add_argument("--label", help="restrict `find` to one node label")
+    query.add_argument("--json", action="store_true", help="print the results as JSON")
+    query.set_defaults(handler=cmd_query)
+
+    export = commands.add_parser("export", help="export the graph in chunks")
+    export.add_argument("output", help="output directory")
+    export.add_argument("--format", default="jsonl", choices=("jsonl", "graphml", "parquet"))
+    export.add_argument("--chunk-size", dest="chunk_size", type=int, default=50000)
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args, load_config(args))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,16 +1,37 @@
-from pyflakes import api
-from pyflakes.reporter import Reporter
-from neo4j import GraphDatabase
 import ast
+import functools
 from src.enums import NodeType, EdgeType
-from halo import Halo
+
+# neo4j, halo and pyflakes are slow to import, so they are loaded on first use
+
+
+def __getattr__(name: str):
+    if name == "GraphDatabase":
+        from neo4j import GraphDatabase
+        return GraphDatabase
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def spinner(text: str):
+    """
+    Shows a halo spinner while the decorated function runs.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            from halo import Halo
+            with Halo(text=text, spinner="dots"):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
 
 class CodebaseParser:
     def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str) -> None:
+        from neo4j import GraphDatabase
         self.driver = GraphDatabase.driver(uri=neo4j_uri, auth=(neo4j_user, neo4j_password))
 
 
-    @Halo(text="Parsing codebase...", spinner="dots")
+    @spinner("Parsing codebase...")
     def parse_file(self, file_path: str) -> None:
         with open(file_path, 'r') as f:
             code: str = f.read()
@@ -133,6 +154,7 @@ class CodebaseParser:
         with open(file_path, 'r') as f:
             code: str = f.read()
 
+        from pyflakes import api
         tree, w = api.parse(code, filename=file_path)
         self.process_tree(tree, file_path)
 
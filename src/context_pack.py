@@ -0,0 +1,164 @@
+import mmap
+import os
+from collections import OrderedDict, deque
+
+# Relationships followed when collecting the neighbourhood of a symbol
+CONTEXT_RELATIONSHIPS = ("CALLS", "BELONGS_TO", "INHERITS")
+# Labels a context pack can start from; each has a qualname index
+CONTEXT_LABELS = ("Function", "Class", "Variable")
+# Each mapped file holds a file descriptor, so only this many stay mapped
+DEFAULT_MAX_MAPS = 64
+
+
+class SourceReader:
+    """
+    Slices source snippets out of memory-mapped files, keeping the
+    `max_maps` most recently used files mapped.
+    """
+
+    def __init__(self, max_maps: int=DEFAULT_MAX_MAPS) -> None:
+        self.max_maps = max_maps
+        self.maps: OrderedDict = OrderedDict()
+
+    def snippet(self, file_path: str, start_byte: int, end_byte: int):
+        """
+        Returns the source between two byte offsets, or None when the file is
+        gone, unreadable or now ends before `end_byte`.
+        """
+        try:
+            size = os.stat(file_path).st_size
+        except OSError:
+            self.discard(file_path)
+            return None
+        mapped = self.maps.get(file_path)
+        if mapped is not None and len(mapped) != size:
+            # Changed since it was mapped; touching pages past a new, shorter end raises SIGBUS
+            self.discard(file_path)
+            mapped = None
+        if end_byte > size:
+            return None
+        if mapped is None:
+            try:
+                with open(file_path, 'rb') as f:
+                    try:
+                        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except ValueError:
+                        # Empty files cannot be mapped
+                        mapped = b""
+            except OSError:
+                return None
+            self.maps[file_path] = mapped
+            if len(self.maps) > self.max_maps:
+                self.discard(next(iter(self.maps)))
+        else:
+            self.maps.move_to_end(file_path)
+        return mapped[start_byte:end_byte].decode("utf-8", errors="replace")
+
+    def discard(self, file_path: str) -> None:
+        mapped = self.maps.pop(file_path, None)
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+
+    def close(self) -> None:
+        for file_path in list(self.maps):
+            self.discard(file_path)
+
+    def __enter__(self) -> "SourceReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _entry(label: str, props: dict, distance: int, reader: SourceReader) -> dict:
+    entry = {
+        "label": label,
+        "qualname": props.get("qualname"),
+        "file": props.get("file"),
+        "lineno": props.get("lineno"),
+        "end_lineno": props.get("end_lineno"),
+        "distance": distance,
+        "source": None,
+    }
+    if props.get("start_byte") is not None and props.get("file"):
+        entry["source"] = reader.snippet(props["file"], props["start_byte"], props["end_byte"])
+    return entry
+
+
+class ContextIndex:
+    """
+    In-memory adjacency over the CALLS/BELONGS_TO/INHERITS edges of a set of
+    FileFacts, answering context pack queries without touching the store.
+    """
+
+    def __init__(self, facts_list=()) -> None:
+        self.nodes: dict = {}
+        self.neighbours: dict = {}
+        self.by_name: dict = {}
+        self.reader = SourceReader()
+        for facts in facts_list:
+            self.add(facts)
+
+    def add(self, facts) -> None:
+        for key, props in facts.nodes.items():
+            if key[0] in ("Function", "Class", "Variable"):
+                self.nodes[key] = props
+                self.by_name.setdefault(key[1], []).append(key)
+        for src, rel, dst in facts.edges:
+            if rel in CONTEXT_RELATIONSHIPS:
+                # The neighbourhood is undirected: callers matter as much as callees
+                self.neighbours.setdefault(src, set()).add(dst)
+                self.neighbours.setdefault(dst, set()).add(src)
+
+    def context_pack(self, symbol: str, hops: int=1) -> list:
+        """
+        Returns the symbols within `hops` edges of `symbol` (a qualified name),
+        nearest first, each with its location and exact source snippet.
+        """
+        distances: dict = {}
+        queue = deque((key, 0) for key in self.by_name.get(symbol, []))
+        while queue:
+            key, distance = queue.popleft()
+            if key in distances:
+                continue
+            distances[key] = distance
+            if distance < hops:
+                for neighbour in self.neighbours.get(key, ()):
+                    if neighbour not in distances:
+                        queue.append((neighbour, distance + 1))
+
+        pack = []
+        for key, distance in sorted(distances.items(), key=lambda item: (item[1], item[0])):
+            if key not in self.nodes:
+                continue
+            props = {**self.nodes[key], "qualname": key[1], "file": key[2]}
+            pack.append(_entry(key[0], props, distance, self.reader))
+        return pack
+
+
+def context_pack_from_store(session, symbol: str, hops: int=1, reader: SourceReader=None) -> list:
+    """
+    Returns the k-hop CALLS/BELONGS_TO/INHERITS neighbourhood of `symbol` from
+    the graph store, with source snippets sliced from the files on disk.
+    """
+    hops = int(hops)
+    result = session.run(
+        f"MATCH (start:{'|'.join(CONTEXT_LABELS)} {{qualname: $symbol}}) "
+        f"MATCH path = (start)-[:{'|'.join(CONTEXT_RELATIONSHIPS)}*0..{hops}]-(n) "
+        f"WHERE n.qualname IS NOT NULL "
+        f"RETURN labels(n)[0] AS label, properties(n) AS props, min(length(path)) AS distance "
+        f"ORDER BY distance, props.file, props.qualname",
+        symbol=symbol
+    )
+    if reader is not None:
+        return [_entry(record["label"], record["props"], record["distance"], reader) for record in result]
+    with SourceReader() as reader:
+        return [_entry(record["label"], record["props"], record["distance"], reader) for record in result]
+
+
+def ensure_context_indexes(session) -> None:
+    """
+    Creates the qualname indexes context_pack_from_store looks its start symbol up by.
+    """
+    for label in CONTEXT_LABELS:
+        session.run(f"CREATE INDEX {label.lower()}_qualname IF NOT EXISTS FOR (n:{label}) ON (n.qualname)")
@@ -0,0 +1,380 @@
+import ast
+import codecs
+import io
+import tokenize
+from src.enums import NodeType
+
+# Labels whose nodes are shared between files and identified by name alone.
+SHARED_LABELS = ("Module", "Directory")
+
+# Nodes that add a branch to a function's cyclomatic complexity
+DECISION_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp,
+                  ast.ExceptHandler, ast.match_case, ast.Assert)
+# Statements whose bodies count towards a function's nesting depth
+BLOCK_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try, ast.Match)
+
+
+def node_identity(key: tuple) -> dict:
+    """
+    Returns the properties that identify a node key in the graph store.
+    """
+    label, name, file_path = key
+    if label in ("File", "Directory"):
+        return {"path": name}
+    if label == "Module":
+        return {"name": name}
+    return {"qualname": name, "file": file_path}
+
+
+class FileFacts:
+    """
+    The nodes and edges a single source file contributes to the graph.
+
+    Nodes are keyed by ``(label, qualname, file)`` and map to their property dict.
+    Edges are ``(source_key, relationship, target_key)`` tuples.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.nodes: dict = {}
+        self.edges: set = set()
+
+    def add_node(self, label: str, qualname: str, **props) -> tuple:
+        file_path = "" if label in SHARED_LABELS else self.file_path
+        key = (label, qualname, file_path)
+        self.nodes.setdefault(key, {}).update(props)
+        return key
+
+    def add_edge(self, source: tuple, relationship: str, target: tuple) -> None:
+        self.edges.add((source, relationship, target))
+
+    def to_dict(self) -> dict:
+        return {
+            "file": self.file_path,
+            "nodes": [[list(key), props] for key, props in self.nodes.items()],
+            "edges": [[list(src), rel, list(dst)] for src, rel, dst in sorted(self.edges)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FileFacts":
+        facts = cls(data["file"])
+        for key, props in data["nodes"]:
+            facts.nodes[tuple(key)] = props
+        for src, rel, dst in data["edges"]:
+            facts.edges.add((tuple(src), rel, tuple(dst)))
+        return facts
+
+
+class FactExtractor(ast.NodeVisitor):
+    """
+    Walks a module AST once and records its functions, classes, variables,
+    imports, calls and inheritance as a FileFacts instance.
+    """
+
+    def __init__(self, file_path: str, source: bytes=None) -> None:
+        self.facts = FileFacts(file_path)
+        self.file_key = self.facts.add_node("File", file_path)
+        # Byte offset at which each line starts, used to turn AST positions into byte spans.
+        # AST columns count UTF-8 bytes, so spans are only recorded for UTF-8 sources.
+        self.line_offsets: list = None
+        if source is not None and tokenize.detect_encoding(io.BytesIO(source).readline)[0] in ("utf-8", "utf-8-sig"):
+            self.line_offsets = line_offsets(source)
+            if source.startswith(codecs.BOM_UTF8):
+                # Columns on the first line are counted after the byte order mark
+                self.line_offsets[0] = len(codecs.BOM_UTF8)
+        # Stack of (node_key, ast_node) for the enclosing definitions
+        self.scope: list = []
+        self.calls: list = []
+        # Running metrics of the functions and classes on the scope stack
+        self.metrics: dict = {}
+        # `elif` branches, which sit at the nesting depth of their `if`
+        self.elif_branches: set = set()
+
+    def visit(self, node: ast.AST) -> None:
+        """
+        Dispatches like NodeVisitor.visit, updating the complexity and nesting
+        depth of the innermost enclosing function on the way.
+        """
+        metrics = self.metrics.get(self.scope[-1][0]) if self.scope and self.scope[-1][0][0] == "Function" else None
+        if metrics is None:
+            return super().visit(node)
+
+        if isinstance(node, ast.comprehension):
+            metrics["complexity"] += 1 + len(node.ifs)
+        elif isinstance(node, DECISION_NODES):
+            metrics["complexity"] += 1
+        elif isinstance(node, ast.BoolOp):
+            metrics["complexity"] += len(node.values) - 1
+
+        if isinstance(node, ast.If) and len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If) \
+                and node.orelse[0].col_offset == node.col_offset:
+            # An `else: if` block is indented further; an `elif` is not
+            self.elif_branches.add(node.orelse[0])
+        if node in self.elif_branches:
+            self.elif_branches.discard(node)
+            return super().visit(node)
+        if not isinstance(node, BLOCK_NODES):
+            return super().visit(node)
+        metrics["depth"] += 1
+        metrics["nesting_depth"] = max(metrics["nesting_depth"], metrics["depth"])
+        super().visit(node)
+        metrics["depth"] -= 1
+
+    def extract(self, tree: ast.AST) -> FileFacts:
+        self.visit(tree)
+        self.link_calls()
+        self.link_inheritance()
+        return self.facts
+
+    def qualify(self, name: str) -> str:
+        if not self.scope:
+            return name
+        return f"{self.scope[-1][0][1]}.{name}"
+
+    def owner_key(self) -> tuple:
+        return self.scope[-1][0] if self.scope else self.file_key
+
+    def span(self, node: ast.AST) -> dict:
+        """
+        Returns the line range and, when the source is known, the byte range of a node.
+        """
+        span = {"lineno": node.lineno, "end_lineno": node.end_lineno}
+        if self.line_offsets is not None:
+            # col_offset and end_col_offset are UTF-8 byte offsets into their line
+            span["start_byte"] = self.line_offsets[node.lineno - 1] + node.col_offset
+            span["end_byte"] = self.line_offsets[node.end_lineno - 1] + node.end_col_offset
+        return span
+
+    def definition_span(self, node: ast.AST) -> dict:
+        # Include decorators in the span of functions and classes
+        first = node.decorator_list[0] if node.decorator_list else node
+        span = self.span(node)
+        start = self.span(first)
+        span["lineno"] = start["lineno"]
+        if "start_byte" in start:
+            span["start_byte"] = start["start_byte"]
+        return span
+
+    def visit_FunctionDef(self, node) -> None:
+        key = self.facts.add_node(
+            "Function", self.qualify(node.name),
+            name=node.name, type=NodeType.FUNCTION.value,
+            **self.definition_span(node),
+        )
+        owner = self.owner_key()
+        self.facts.add_edge(key, "BELONGS_TO", owner)
+        if owner in self.metrics and owner[0] == "Class":
+            self.metrics[owner]["methods"].add(node.name)
+
+        args = node.args
+        self.metrics[key] = {"complexity": 1, "nesting_depth": 0, "depth": 0}
+        self.scope.append((key, node))
+        self.generic_visit(node)
+        self.scope.pop()
+        metrics = self.metrics.pop(key)
+        self.facts.nodes[key].update(
+            loc=node.end_lineno - node.lineno + 1,
+            complexity=metrics["complexity"],
+            nesting_depth=metrics["nesting_depth"],
+            param_count=(len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs)
+                         + (args.vararg is not None) + (args.kwarg is not None)),
+        )
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        bases = [dotted_name(base) for base in node.bases]
+        key = self.facts.add_node(
+            "Class", self.qualify(node.name),
+            name=node.name, type=NodeType.CLASS.value,
+            bases=[base for base in bases if base],
+            **self.definition_span(node),
+        )
+        self.facts.add_edge(key, "BELONGS_TO", self.owner_key())
+        self.metrics[key] = {"methods": set(), "attributes": set()}
+        self.scope.append((key, node))
+        self.generic_visit(node)
+        self.scope.pop()
+        metrics = self.metrics.pop(key)
+        self.facts.nodes[key].update(
+            loc=node.end_lineno - node.lineno + 1,
+            method_count=len(metrics["methods"]),
+            attribute_count=len(metrics["attributes"]),
+        )
+
+    def add_instance_attribute(self, target: ast.AST) -> None:
+        """
+        Counts ``self.x = ...`` in a method as an attribute of the method's class.
+        """
+        if not (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                and target.value.id == "self" and len(self.scope) >= 2):
+            return
+        owner = self.scope[-2][0]
+        if self.scope[-1][0][0] == "Function" and owner[0] == "Class":
+            self.metrics[owner]["attributes"].add(target.attr)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.add_variable(target.id, node)
+            else:
+                self.add_instance_attribute(target)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if isinstance(node.target, ast.Name):
+            self.add_variable(node.target.id, node)
+        else:
+            self.add_instance_attribute(node.target)
+        self.generic_visit(node)
+
+    def add_variable(self, name: str, statement: ast.AST) -> tuple:
+        qualname = self.qualify(name)
+        existing = ("Variable", qualname, self.facts.file_path) in self.facts.nodes
+        # A variable's span is that of its first assignment
+        span = {} if existing else self.span(statement)
+        key = self.facts.add_node(
+            "Variable", qualname,
+            name=name, type=NodeType.VARIABLE.value, **span,
+        )
+        owner = self.owner_key()
+        self.facts.add_edge(key, "BELONGS_TO", owner)
+        if owner in self.metrics and owner[0] == "Class":
+            self.metrics[owner]["attributes"].add(name)
+        return key
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.add_import(alias.name)
+            if alias.asname:
+                self.add_alias(alias.asname, alias.name)
+            else:
+                # "import a.b" binds "a"
+                first = alias.name.split(".")[0]
+                self.add_alias(first, first)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module_name: str = "." * node.level + (node.module or "")
+        for alias in node.names:
+            if alias.name == "*":
+                # Handle "from module import *"
+                self.add_import(module_name)
+                continue
+            full_name = f"{module_name}.{alias.name}" if node.module else module_name + alias.name
+            self.add_import(full_name)
+            self.add_alias(alias.asname or alias.name, full_name)
+
+    def add_import(self, module_name: str) -> None:
+        key = self.facts.add_node("Module", module_name, name=module_name, type=NodeType.MODULE.value)
+        self.facts.add_edge(self.file_key, "IMPORTS", key)
+
+    def add_alias(self, local_name: str, target: str) -> None:
+        """
+        Records which imported name a local name is bound to, as "local=target"
+        strings on the File node, so names can be resolved across modules later.
+        """
+        aliases = self.facts.nodes[self.file_key].setdefault("import_aliases", [])
+        entry = f"{local_name}={target}"
+        if entry not in aliases:
+            aliases.append(entry)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        caller = self.enclosing_function()
+        if caller is not None:
+            self.calls.append((caller, node.func))
+        self.generic_visit(node)
+
+    def enclosing_function(self):
+        for key, _ in reversed(self.scope):
+            if key[0] == "Function":
+                return key
+        return None
+
+    def link_calls(self) -> None:
+        """
+        Resolves call expressions to functions defined in the same file.
+        """
+        functions: dict = {}
+        for key, props in self.facts.nodes.items():
+            if key[0] == "Function":
+                functions.setdefault(props["name"], []).append(key)
+
+        for caller, func in self.calls:
+            if isinstance(func, ast.Name):
+                candidates = functions.get(func.id, [])
+                # Prefer a module-level definition over a method of the same name
+                top_level = [key for key in candidates if "." not in key[1]]
+                for callee in (top_level or candidates)[:1]:
+                    self.facts.add_edge(caller, "CALLS", callee)
+            elif (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                  and func.value.id in ("self", "cls")):
+                # self.method() resolves to a sibling method of the caller's class
+                class_name = caller[1].rpartition(".")[0]
+                callee = ("Function", f"{class_name}.{func.attr}", caller[2])
+                if callee in self.facts.nodes:
+                    self.facts.add_edge(caller, "CALLS", callee)
+
+    def link_inheritance(self) -> None:
+        """
+        Creates INHERITS edges for bases defined in the same file.
+        """
+        classes = {props["name"]: key for key, props in self.facts.nodes.items() if key[0] == "Class"}
+        for key, props in list(self.facts.nodes.items()):
+            if key[0] != "Class":
+                continue
+            for base in props["bases"]:
+                if base in classes:
+                    self.facts.add_edge(key, "INHERITS", classes[base])
+
+
+def dotted_name(node: ast.AST) -> str:
+    """
+    Returns ``a.b.c`` for Name/Attribute chains and an empty string otherwise.
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return ""
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def line_offsets(source: bytes) -> list:
+    """
+    Returns the byte offset at which each line of `source` starts.
+    """
+    offsets = [0]
+    position = source.find(b"\n")
+    while position != -1:
+        offsets.append(position + 1)
+        position = source.find(b"\n", position + 1)
+    return offsets
+
+
+def extract_facts(tree: ast.AST, file_path: str, source: bytes=None) -> FileFacts:
+    """
+    Extracts the FileFacts for an already parsed module. Byte offsets are only
+    recorded when the raw `source` bytes are given and are UTF-8.
+    """
+    return FactExtractor(file_path, source).extract(tree)
+
+
+def read_and_parse(file_path: str) -> tuple:
+    """
+    Reads a Python file as bytes and parses it. Returns (source, tree).
+    """
+    with open(file_path, 'rb') as f:
+        source: bytes = f.read()
+
+    tree: ast.AST = ast.parse(source, filename=file_path)
+    return source, tree
+
+
+def extract_file(file_path: str) -> FileFacts:
+    """
+    Parses a Python file and extracts its FileFacts.
+    """
+    source, tree = read_and_parse(file_path)
+    return extract_facts(tree, file_path, source)
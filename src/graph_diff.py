@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import re
+from src.extraction import FileFacts, node_identity, SHARED_LABELS
+from src.metrics import DERIVED_PROPERTIES
+from src.class_hierarchy import HIERARCHY_PROPERTIES, HIERARCHY_RELATIONSHIPS
+from src.import_graph import IMPORT_GRAPH_PROPERTIES
+
+# Labels the delta writer is allowed to interpolate into Cypher
+KNOWN_LABELS = ("File", "Directory", "Module", "Function", "Class", "Variable")
+# Labels of the nodes a file owns, identified by their `file` property
+FILE_LABELS = ("Function", "Class", "Variable")
+SNAPSHOT_NAME = re.compile(r"^[0-9a-f]{40}\.json$")
+
+
+class GraphDelta:
+    """
+    The difference between two FileFacts snapshots of the same file.
+    """
+
+    def __init__(self) -> None:
+        self.added_nodes: dict = {}
+        self.removed_nodes: list = []
+        self.changed_nodes: dict = {}
+        self.added_edges: list = []
+        self.removed_edges: list = []
+
+    def is_empty(self) -> bool:
+        return not (self.added_nodes or self.removed_nodes or self.changed_nodes
+                    or self.added_edges or self.removed_edges)
+
+    def __len__(self) -> int:
+        return (len(self.added_nodes) + len(self.removed_nodes) + len(self.changed_nodes)
+                + len(self.added_edges) + len(self.removed_edges))
+
+
+def diff_facts(old: FileFacts, new: FileFacts) -> GraphDelta:
+    """
+    Computes the node, edge and property changes needed to turn `old` into `new`.
+    """
+    delta = GraphDelta()
+    old_nodes = old.nodes if old is not None else {}
+    old_edges = old.edges if old is not None else set()
+
+    for key, props in new.nodes.items():
+        if key not in old_nodes:
+            delta.added_nodes[key] = props
+            continue
+        changed = {name: value for name, value in props.items() if old_nodes[key].get(name) != value}
+        for name in old_nodes[key]:
+            if name not in props:
+                changed[name] = None
+        if changed:
+            delta.changed_nodes[key] = changed
+
+    # Shared nodes (modules, directories) are owned by no single file and are never removed here
+    delta.removed_nodes = [key for key in old_nodes
+                           if key not in new.nodes and key[0] not in SHARED_LABELS]
+    delta.added_edges = sorted(new.edges - old_edges)
+    delta.removed_edges = sorted(old_edges - new.edges)
+    return delta
+
+
+class SnapshotCache:
+    """
+    Stores the last applied FileFacts of each file as JSON in a directory.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def snapshot_path(self, file_path: str) -> str:
+        digest = hashlib.sha1(file_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def load(self, file_path: str):
+        try:
+            with open(self.snapshot_path(file_path), 'r', encoding="utf-8") as f:
+                return FileFacts.from_dict(json.load(f))
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def save(self, facts: FileFacts) -> None:
+        path = self.snapshot_path(facts.file_path)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump(facts.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def file_paths(self) -> list:
+        """
+        Returns the path of every file with a stored snapshot.
+        """
+        file_paths = []
+        for name in sorted(os.listdir(self.cache_dir)):
+            # Other files, such as the symbol index, may share the directory
+            if not SNAPSHOT_NAME.match(name):
+                continue
+            try:
+                with open(os.path.join(self.cache_dir, name), 'r', encoding="utf-8") as f:
+                    file_paths.append(json.load(f)["file"])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        return file_paths
+
+    def discard(self, file_path: str) -> None:
+        try:
+            os.remove(self.snapshot_path(file_path))
+        except FileNotFoundError:
+            pass
+
+
+def _key_from_record(labels: list, props: dict, file_path: str):
+    for label in KNOWN_LABELS:
+        if label not in labels:
+            continue
+        if label == "File":
+            return (label, props.get("path"), props.get("path"))
+        if label == "Directory":
+            return (label, props.get("path"), "")
+        if label == "Module":
+            return (label, props.get("name"), "")
+        if props.get("qualname") is None:
+            return None
+        return (label, props["qualname"], file_path)
+    return None
+
+
+def read_snapshot_from_store(session, file_path: str) -> FileFacts:
+    """
+    Rebuilds the FileFacts of a file from what is currently stored in the graph.
+    """
+    facts = FileFacts(file_path)
+    file_record = session.run(
+        "MATCH (file:File {path: $file}) RETURN properties(file) AS props",
+        file=file_path
+    ).single()
+    if file_record:
+        # Without a stored File node, the delta must add it before its BELONGS_TO edges
+        file_props = {name: value for name, value in file_record["props"].items()
+                      if name not in ("path",) + IMPORT_GRAPH_PROPERTIES}
+        facts.nodes[("File", file_path, file_path)] = file_props
+    # One labelled lookup per owned label, so each can use its `file` index
+    records = []
+    for label in FILE_LABELS:
+        records.extend(session.run(
+            f"MATCH (n:{label} {{file: $file}}) "
+            f"OPTIONAL MATCH (n)-[r]->(m) "
+            f"RETURN labels(n) AS labels, properties(n) AS props, type(r) AS rel, "
+            f"labels(m) AS target_labels, properties(m) AS target_props",
+            file=file_path
+        ))
+    for record in records:
+        key = _key_from_record(record["labels"], record["props"], file_path)
+        if key is None:
+            continue
+        # Derived metrics and hierarchy data are maintained by their own passes, not the facts
+        facts.nodes[key] = {name: value for name, value in record["props"].items()
+                            if name not in ("qualname", "file") + DERIVED_PROPERTIES + HIERARCHY_PROPERTIES}
+        if record["rel"] is None or record["rel"] in HIERARCHY_RELATIONSHIPS:
+            continue
+        # Edges may point at nodes of other files, such as a CALLS to an imported function
+        target = _key_from_record(record["target_labels"], record["target_props"], record["target_props"].get("file"))
+        if target is not None:
+            facts.edges.add((key, record["rel"], target))
+
+    result = session.run(
+        "MATCH (file:File {path: $file})-[:IMPORTS]->(module:Module) RETURN properties(module) AS props",
+        file=file_path
+    )
+    for record in result:
+        module_key = ("Module", record["props"]["name"], "")
+        facts.nodes[module_key] = record["props"]
+        facts.edges.add((("File", file_path, file_path), "IMPORTS", module_key))
+    return facts
+
+
+def ensure_file_indexes(session) -> None:
+    """
+    Creates the `file` indexes read_snapshot_from_store looks a file's nodes up by.
+    """
+    for label in FILE_LABELS:
+        session.run(f"CREATE INDEX {label.lower()}_file IF NOT EXISTS FOR (n:{label}) ON (n.file)")
+
+
+def _identity_pattern(variable: str, label: str, param: str) -> str:
+    if label not in KNOWN_LABELS:
+        raise ValueError(f"Unknown node label: {label}")
+    fields = ", ".join(f"{name}: {param}.{name}" for name in node_identity((label, "", "")))
+    return f"({variable}:{label} {{{fields}}})"
+
+
+def _group_by(items, key_func) -> dict:
+    groups: dict = {}
+    for item in items:
+        groups.setdefault(key_func(item), []).append(item)
+    return groups
+
+
+def apply_delta(session, delta: GraphDelta) -> int:
+    """
+    Writes a GraphDelta to the store with one UNWIND statement per label or
+    relationship group. Returns the number of statements issued.
+    """
+    statements = 0
+
+    for (src_label, rel, dst_label), edges in _group_by(
+            delta.removed_edges, lambda e: (e[0][0], e[1], e[2][0])).items():
+        session.run(
+            f"UNWIND $rows AS row "
+            f"MATCH {_identity_pattern('a', src_label, 'row.src')}"
+            f"-[r:{rel}]->{_identity_pattern('b', dst_label, 'row.dst')} "
+            f"DELETE r",
+            rows=[{"src": node_identity(src), "dst": node_identity(dst)} for src, _, dst in edges]
+        )
+        statements += 1
+
+    for label, keys in _group_by(delta.removed_nodes, lambda k: k[0]).items():
+        session.run(
+            f"UNWIND $rows AS row "
+            f"MATCH {_identity_pattern('n', label, 'row')} "
+            f"DETACH DELETE n",
+            rows=[node_identity(key) for key in keys]
+        )
+        statements += 1
+
+    upserts = list(delta.added_nodes.items()) + list(delta.changed_nodes.items())
+    for label, nodes in _group_by(upserts, lambda item: item[0][0]).items():
+        session.run(
+            f"UNWIND $rows AS row "
+            f"MERGE {_identity_pattern('n', label, 'row.id')} "
+            f"SET n += row.props",
+            rows=[{"id": node_identity(key), "props": props} for key, props in nodes]
+        )
+        statements += 1
+
+    for (src_label, rel, dst_label), edges in _group_by(
+            delta.added_edges, lambda e: (e[0][0], e[1], e[2][0])).items():
+        session.run(
+            f"UNWIND $rows AS row "
+            f"MATCH {_identity_pattern('a', src_label, 'row.src')}, "
+            f"{_identity_pattern('b', dst_label, 'row.dst')} "
+            f"MERGE (a)-[:{rel}]->(b)",
+            rows=[{"src": node_identity(src), "dst": node_identity(dst)} for src, _, dst in edges]
+        )
+        statements += 1
+
+    return statements
@@ -0,0 +1,242 @@
+import json
+import os
+from xml.sax.saxutils import escape, quoteattr
+from src.extraction import node_identity
+from src.source_loader import load_facts
+
+def node_id(key: tuple) -> str:
+    """
+    Returns a stable string id for a FileFacts node key.
+    """
+    label, qualname, file_path = key
+    if label in ("File", "Directory", "Module"):
+        return f"{label}:{qualname}"
+    return f"{label}:{file_path}:{qualname}"
+
+
+def iter_facts_records(file_paths):
+    """
+    Yields ("node", record) and ("edge", record) tuples straight from the
+    extraction IR, one file at a time. Only the ids of shared module and
+    directory nodes are remembered across files.
+    """
+    seen_shared: set = set()
+    for file_path in file_paths:
+        facts = load_facts(file_path)
+        for key, props in facts.nodes.items():
+            if key[0] in ("Module", "Directory"):
+                if key in seen_shared:
+                    continue
+                seen_shared.add(key)
+            yield "node", {"id": node_id(key), "labels": [key[0]], "props": {**node_identity(key), **props}}
+        for src, rel, dst in sorted(facts.edges):
+            yield "edge", {"source": node_id(src), "target": node_id(dst), "type": rel, "props": {}}
+
+
+def iter_store_records(session, page_size: int=10000):
+    """
+    Yields ("node", record) and ("edge", record) tuples from the graph store,
+    paging through nodes and relationships by internal id range so neither the
+    client nor the server ever holds the full graph.
+    """
+    last_id = -1
+    while True:
+        records = list(session.run(
+            "MATCH (n) WHERE id(n) > $last_id "
+            "RETURN id(n) AS id, labels(n) AS labels, properties(n) AS props "
+            "ORDER BY id(n) LIMIT $limit",
+            last_id=last_id, limit=page_size
+        ))
+        for record in records:
+            yield "node", {"id": str(record["id"]), "labels": record["labels"], "props": record["props"]}
+        if len(records) < page_size:
+            break
+        last_id = records[-1]["id"]
+
+    last_id = -1
+    while True:
+        records = list(session.run(
+            "MATCH (a)-[r]->(b) WHERE id(r) > $last_id "
+            "RETURN id(r) AS id, id(a) AS source, id(b) AS target, type(r) AS type, properties(r) AS props "
+            "ORDER BY id(r) LIMIT $limit",
+            last_id=last_id, limit=page_size
+        ))
+        for record in records:
+            yield "edge", {
+                "source": str(record["source"]), "target": str(record["target"]),
+                "type": record["type"], "props": record["props"],
+            }
+        if len(records) < page_size:
+            break
+        last_id = records[-1]["id"]
+
+
+class ChunkWriter:
+    """
+    Base class for writers that emit one file per chunk of records.
+    """
+    extension = ""
+
+    def __init__(self, path: str, kind: str) -> None:
+        self.path = path
+        self.kind = kind
+
+    def write(self, record: dict) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class JsonlChunkWriter(ChunkWriter):
+    extension = "jsonl"
+
+    def __init__(self, path: str, kind: str) -> None:
+        super().__init__(path, kind)
+        self.file = open(path, 'w', encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        self.file.write(json.dumps(record, default=str))
+        self.file.write("\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class GraphMLChunkWriter(ChunkWriter):
+    """
+    Writes each chunk as a standalone GraphML document. Labels and properties
+    are stored as JSON strings so every chunk shares the same key declarations.
+    """
+    extension = "graphml"
+
+    def __init__(self, path: str, kind: str) -> None:
+        super().__init__(path, kind)
+        self.file = open(path, 'w', encoding="utf-8")
+        self.file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <key id="labels" for="node" attr.name="labels" attr.type="string"/>\n'
+            '  <key id="type" for="edge" attr.name="type" attr.type="string"/>\n'
+            '  <key id="props" for="all" attr.name="props" attr.type="string"/>\n'
+            '  <graph edgedefault="directed">\n'
+        )
+
+    def write(self, record: dict) -> None:
+        props = escape(json.dumps(record["props"], default=str))
+        if self.kind == "node":
+            self.file.write(
+                f'    <node id={quoteattr(record["id"])}>'
+                f'<data key="labels">{escape(json.dumps(record["labels"]))}</data>'
+                f'<data key="props">{props}</data></node>\n'
+            )
+        else:
+            self.file.write(
+                f'    <edge source={quoteattr(record["source"])} target={quoteattr(record["target"])}>'
+                f'<data key="type">{escape(record["type"])}</data>'
+                f'<data key="props">{props}</data></edge>\n'
+            )
+
+    def close(self) -> None:
+        self.file.write('  </graph>\n</graphml>\n')
+        self.file.close()
+
+
+class ParquetChunkWriter(ChunkWriter):
+    """
+    Buffers one chunk of rows and writes it as a Parquet file. Requires pyarrow.
+    """
+    extension = "parquet"
+
+    def __init__(self, path: str, kind: str) -> None:
+        super().__init__(path, kind)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+        self.pyarrow = pyarrow
+        self.columns: dict = {}
+
+    def write(self, record: dict) -> None:
+        row = dict(record)
+        row["props"] = json.dumps(row["props"], default=str)
+        if "labels" in row:
+            row["labels"] = json.dumps(row["labels"])
+        for name, value in row.items():
+            self.columns.setdefault(name, []).append(value)
+
+    def close(self) -> None:
+        table = self.pyarrow.table(self.columns)
+        self.pyarrow.parquet.write_table(table, self.path)
+        self.columns = {}
+
+
+WRITERS = {
+    "jsonl": JsonlChunkWriter,
+    "graphml": GraphMLChunkWriter,
+    "parquet": ParquetChunkWriter,
+}
+
+
+class GraphExporter:
+    """
+    Streams node and edge records into fixed-size chunk files and records a
+    manifest of the chunks written.
+    """
+
+    def __init__(self, output_dir: str, export_format: str="jsonl", chunk_size: int=50000) -> None:
+        if export_format not in WRITERS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        self.output_dir = output_dir
+        self.writer_class = WRITERS[export_format]
+        self.export_format = export_format
+        self.chunk_size = chunk_size
+        self.chunks: list = []
+        self.counters: dict = {}
+        # Open (writer, manifest entry) pair per record kind
+        self.open_chunks: dict = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def export(self, records) -> dict:
+        """
+        Consumes ("node" | "edge", record) tuples and returns the manifest.
+        """
+        for kind, record in records:
+            if kind not in self.open_chunks:
+                self.open_chunk(kind)
+            writer, entry = self.open_chunks[kind]
+            writer.write(record)
+            entry["records"] += 1
+            if entry["records"] >= self.chunk_size:
+                self.close_chunk(kind)
+
+        for kind in list(self.open_chunks):
+            self.close_chunk(kind)
+        return self.write_manifest()
+
+    def open_chunk(self, kind: str) -> None:
+        number = self.counters.get(kind, 0)
+        self.counters[kind] = number + 1
+        file_name = f"{kind}s-{number:05d}.{self.writer_class.extension}"
+        writer = self.writer_class(os.path.join(self.output_dir, file_name), kind)
+        entry = {"file": file_name, "kind": kind, "records": 0}
+        self.chunks.append(entry)
+        self.open_chunks[kind] = (writer, entry)
+
+    def close_chunk(self, kind: str) -> None:
+        writer, entry = self.open_chunks.pop(kind)
+        writer.close()
+        entry["bytes"] = os.path.getsize(writer.path)
+
+    def write_manifest(self) -> dict:
+        manifest = {
+            "format": self.export_format,
+            "chunk_size": self.chunk_size,
+            "nodes": sum(c["records"] for c in self.chunks if c["kind"] == "node"),
+            "edges": sum(c["records"] for c in self.chunks if c["kind"] == "edge"),
+            "chunks": self.chunks,
+        }
+        with open(os.path.join(self.output_dir, "manifest.json"), 'w', encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
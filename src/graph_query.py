@@ -0,0 +1,162 @@
+import base64
+import json
+import re
+
+# Keyset-paginated templates: each filters on $last_id, orders by the id it
+# returns as _cursor_id and stops at $limit
+CALLS_QUERY = (
+    "MATCH (caller:Function)-[r:CALLS]->(callee:Function) WHERE id(r) > $last_id "
+    "RETURN id(r) AS _cursor_id, caller.qualname AS caller, caller.file AS caller_file, "
+    "callee.qualname AS callee, callee.file AS callee_file "
+    "ORDER BY id(r) LIMIT $limit"
+)
+RELATIONSHIPS_QUERY = (
+    "MATCH (a)-[r:{rel_type}]->(b) WHERE id(r) > $last_id "
+    "RETURN id(r) AS _cursor_id, id(a) AS source, id(b) AS target, type(r) AS type, "
+    "properties(r) AS props "
+    "ORDER BY id(r) LIMIT $limit"
+)
+NODES_QUERY = (
+    "MATCH (n:{label}) WHERE id(n) > $last_id "
+    "RETURN id(n) AS _cursor_id, labels(n) AS labels, properties(n) AS props "
+    "ORDER BY id(n) LIMIT $limit"
+)
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# Cursor tokens name one of these templates; they never carry query text
+TEMPLATES = {"calls": CALLS_QUERY, "relationships": RELATIONSHIPS_QUERY, "nodes": NODES_QUERY}
+
+
+def build_query(template: str, args: dict) -> str:
+    """
+    Fills a named template, validating every argument as an identifier.
+    """
+    if template not in TEMPLATES:
+        raise ValueError(f"Unknown query template: {template}")
+    query = TEMPLATES[template]
+    for name, value in args.items():
+        if not isinstance(value, str) or not IDENTIFIER.match(value) or "{" + name + "}" not in query:
+            raise ValueError(f"Invalid {name}: {value}")
+        query = query.replace("{" + name + "}", value)
+    if re.search(r"\{[a-z_]+\}", query):
+        raise ValueError(f"Missing arguments for query template: {template}")
+    return query
+
+
+def encode_cursor(state: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, sort_keys=True).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str) -> dict:
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor token") from e
+    if not isinstance(state, dict) or not {"template", "args", "params", "last_id", "page_size"} <= set(state):
+        raise ValueError("Invalid cursor token")
+    if not isinstance(state["last_id"], int) or not isinstance(state["page_size"], int) or state["page_size"] < 1:
+        raise ValueError("Invalid cursor token")
+    if not isinstance(state["args"], dict) or not isinstance(state["params"], dict):
+        raise ValueError("Invalid cursor token")
+    # Rejects unknown templates and invalid labels or relationship types
+    build_query(state["template"], state["args"])
+    return state
+
+
+class KeysetCursor:
+    """
+    Lazy iterator over a keyset-paginated query.
+
+    Each page is a separate query on ``id > last_id``, so the server never
+    builds the full result, and records are yielded as the driver receives
+    them rather than collected into lists. For cursors over a named template,
+    ``token`` captures the position after the last record yielded and can be
+    passed to GraphQuery.resume.
+    """
+
+    def __init__(self, driver, query: str, params: dict=None, page_size: int=1000, last_id: int=-1,
+                 template: str=None, args: dict=None) -> None:
+        self.driver = driver
+        self.query = query
+        self.params = params or {}
+        self.page_size = page_size
+        self.last_id = last_id
+        self.template = template
+        self.args = args or {}
+        self.exhausted = False
+
+    @property
+    def token(self) -> str:
+        if self.template is None:
+            raise ValueError("Cursors over ad-hoc queries cannot be resumed from a token")
+        return encode_cursor({
+            "template": self.template, "args": self.args, "params": self.params,
+            "last_id": self.last_id, "page_size": self.page_size,
+        })
+
+    def __iter__(self):
+        if self.exhausted:
+            return
+        with self.driver.session(fetch_size=self.page_size) as session:
+            while True:
+                result = session.run(self.query, self.params, last_id=self.last_id, limit=self.page_size)
+                count = 0
+                for record in result:
+                    count += 1
+                    data = record.data()
+                    self.last_id = data.pop("_cursor_id")
+                    yield data
+                if count < self.page_size:
+                    self.exhausted = True
+                    return
+
+
+class GraphQuery:
+    """
+    Query layer over the graph store that streams results instead of
+    materializing them.
+    """
+
+    def __init__(self, driver, fetch_size: int=1000) -> None:
+        self.driver = driver
+        self.fetch_size = fetch_size
+
+    def stream(self, query: str, **params):
+        """
+        Yields the records of an arbitrary query as plain dicts, fetching
+        `fetch_size` records at a time from the server.
+        """
+        with self.driver.session(fetch_size=self.fetch_size) as session:
+            for record in session.run(query, params):
+                yield record.data()
+
+    def paginate(self, query: str, page_size: int=None, **params) -> KeysetCursor:
+        """
+        Returns a cursor over a keyset query. The query must filter
+        on ``$last_id``, return the id as ``_cursor_id``, order by it and end
+        with ``LIMIT $limit``. Ad-hoc cursors have no resume token.
+        """
+        return KeysetCursor(self.driver, query, params, page_size or self.fetch_size)
+
+    def resume(self, token: str) -> KeysetCursor:
+        """
+        Continues a template cursor from its token. The token only names the
+        template and its validated arguments, so it cannot carry a query.
+        """
+        state = decode_cursor(token)
+        return self.template_cursor(state["template"], state["args"], state["page_size"],
+                                    state["params"], state["last_id"])
+
+    def template_cursor(self, template: str, args: dict=None, page_size: int=None, params: dict=None,
+                        last_id: int=-1) -> KeysetCursor:
+        args = args or {}
+        return KeysetCursor(self.driver, build_query(template, args), params, page_size or self.fetch_size,
+                            last_id, template, args)
+
+    def calls(self, page_size: int=None) -> KeysetCursor:
+        return self.template_cursor("calls", page_size=page_size)
+
+    def relationships(self, rel_type: str, page_size: int=None) -> KeysetCursor:
+        return self.template_cursor("relationships", {"rel_type": rel_type}, page_size)
+
+    def nodes(self, label: str, page_size: int=None) -> KeysetCursor:
+        return self.template_cursor("nodes", {"label": label}, page_size)
@@ -0,0 +1,263 @@
+from collections import deque
+from src.class_hierarchy import resolve_relative
+
+# Properties persist() writes onto File nodes; they are not part of the extracted facts
+IMPORT_GRAPH_PROPERTIES = ("module", "import_layer", "import_cycle", "import_count", "importer_count")
+
+
+class ModuleGraph:
+    """
+    In-memory module dependency graph built from extracted imports.
+
+    Nodes are the dotted names of modules in the codebase; an edge a -> b
+    means module a imports (something from) module b. Imports of modules
+    outside the codebase are kept separately in `external`. Cycle detection,
+    layering and reverse-dependency queries are linear in the graph size.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict = {}
+        self.raw_imports: dict = {}
+        self.package_flags: dict = {}
+        self.imports: dict = {}
+        self.importers: dict = {}
+        self.external: dict = {}
+        # Every dotted prefix of an absolute import target -> modules importing it,
+        # so a newly added module finds the imports that may now resolve to it
+        self.prefix_importers: dict = {}
+        self.module_prefixes: dict = {}
+        # module -> the row persist() last wrote for it, so unchanged modules are skipped
+        self.persisted: dict = {}
+
+    def update_file(self, facts, module_name: str, is_package: bool=False) -> None:
+        """
+        Replaces the imports of one module and re-resolves the modules whose
+        imports may point at it.
+        """
+        new_module = module_name not in self.files
+        self.files[module_name] = facts.file_path
+        self.package_flags[module_name] = is_package
+        self.raw_imports[module_name] = sorted(
+            dst[1] for src, rel, dst in facts.edges if rel == "IMPORTS"
+        )
+        self.resolve(module_name)
+        if new_module:
+            # Imports that were external (or resolved to a parent package) may now land here
+            for other in list(self.prefix_importers.get(module_name, ())):
+                if other != module_name:
+                    self.resolve(other)
+
+    def remove_module(self, module_name: str) -> None:
+        self.set_imports(module_name, set())
+        for prefix in self.module_prefixes.pop(module_name, set()):
+            self.prefix_importers.get(prefix, set()).discard(module_name)
+        for table in (self.files, self.raw_imports, self.package_flags, self.external, self.imports):
+            table.pop(module_name, None)
+        for importer in list(self.importers.pop(module_name, set())):
+            self.resolve(importer)
+
+    def target_of(self, module_name: str, target: str):
+        """
+        Returns the internal module an import target refers to, or None.
+        """
+        absolute = resolve_relative(target, module_name, self.package_flags.get(module_name, False))
+        # "pkg.mod.Class" refers to the longest prefix that is a known module
+        parts = absolute.split(".")
+        for end in range(len(parts), 0, -1):
+            candidate = ".".join(parts[:end])
+            if candidate in self.files:
+                return candidate
+        return None
+
+    def resolve(self, module_name: str) -> None:
+        internal = set()
+        external = set()
+        prefixes = set()
+        for target in self.raw_imports.get(module_name, ()):
+            absolute = resolve_relative(target, module_name, self.package_flags[module_name])
+            parts = absolute.split(".")
+            prefixes.update(".".join(parts[:end]) for end in range(1, len(parts) + 1))
+            resolved = self.target_of(module_name, target)
+            if resolved is None:
+                external.add(parts[0])
+            elif resolved != module_name:
+                internal.add(resolved)
+        self.external[module_name] = external
+        self.set_imports(module_name, internal)
+
+        for prefix in self.module_prefixes.get(module_name, set()) - prefixes:
+            self.prefix_importers.get(prefix, set()).discard(module_name)
+        for prefix in prefixes:
+            self.prefix_importers.setdefault(prefix, set()).add(module_name)
+        self.module_prefixes[module_name] = prefixes
+
+    def set_imports(self, module_name: str, targets: set) -> None:
+        for old in self.imports.get(module_name, set()) - targets:
+            self.importers.get(old, set()).discard(module_name)
+        for new in targets:
+            self.importers.setdefault(new, set()).add(module_name)
+        self.imports[module_name] = targets
+
+    def strongly_connected_components(self) -> list:
+        """
+        Tarjan's algorithm, iterative so deep import chains do not hit the
+        recursion limit. Components are returned in reverse topological order:
+        every component comes after the components it imports.
+        """
+        index: dict = {}
+        lowlink: dict = {}
+        on_stack: set = set()
+        stack: list = []
+        components: list = []
+        counter = 0
+
+        for root in sorted(self.files):
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.imports.get(root, ()))))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.imports.get(child, ())))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+        return components
+
+    def cycles(self) -> list:
+        """
+        Returns every import cycle as the sorted list of modules involved.
+        """
+        return [component for component in self.strongly_connected_components() if len(component) > 1]
+
+    def layers(self) -> list:
+        """
+        Groups modules into layers: layer 0 imports no other module of the
+        codebase, and every module sits one layer above the highest layer it
+        imports. Modules in a cycle share a layer.
+        """
+        layer_of: dict = {}
+        for component in self.strongly_connected_components():
+            members = set(component)
+            depth = 0
+            for member in component:
+                for target in self.imports.get(member, ()):
+                    if target not in members:
+                        depth = max(depth, layer_of[target] + 1)
+            for member in component:
+                layer_of[member] = depth
+
+        layers: list = []
+        for module_name, depth in layer_of.items():
+            while len(layers) <= depth:
+                layers.append([])
+            layers[depth].append(module_name)
+        return [sorted(layer) for layer in layers]
+
+    def layer_violations(self, allowed: list) -> list:
+        """
+        Given an ordered list of package prefixes from lowest to highest layer,
+        returns (importer, imported) pairs where a lower layer imports a higher one.
+        """
+        def rank(module_name: str):
+            for position, prefix in enumerate(allowed):
+                if module_name == prefix or module_name.startswith(prefix + "."):
+                    return position
+            return None
+
+        violations = []
+        for importer in sorted(self.imports):
+            for imported in sorted(self.imports[importer]):
+                low, high = rank(importer), rank(imported)
+                if low is not None and high is not None and low < high:
+                    violations.append((importer, imported))
+        return violations
+
+    def dependencies(self, module_name: str) -> set:
+        return self._closure(module_name, self.imports)
+
+    def affected_by(self, module_name: str) -> set:
+        """
+        Returns every module that directly or transitively imports `module_name`.
+        """
+        return self._closure(module_name, self.importers)
+
+    @staticmethod
+    def _closure(start: str, edges: dict) -> set:
+        seen = set()
+        queue = deque(edges.get(start, ()))
+        while queue:
+            module_name = queue.popleft()
+            if module_name in seen:
+                continue
+            seen.add(module_name)
+            queue.extend(edges.get(module_name, ()))
+        seen.discard(start)
+        return seen
+
+    def persist(self, session) -> int:
+        """
+        Stores each module's name, layer, cycle membership and direct import
+        and importer counts as properties on its File node. Only modules whose
+        values differ from the last call are sent, and File nodes that already
+        hold them are not written. Returns the number of rows sent.
+        """
+        cycle_of = {}
+        for number, component in enumerate(self.cycles()):
+            for member in component:
+                cycle_of[member] = number
+        layer_of = {member: depth for depth, layer in enumerate(self.layers()) for member in layer}
+        rows = [
+            {
+                "path": file_path, "module": module_name, "layer": layer_of.get(module_name),
+                "cycle": cycle_of.get(module_name),
+                "imports": len(self.imports.get(module_name, ())),
+                "importers": len(self.importers.get(module_name, ())),
+            }
+            for module_name, file_path in sorted(self.files.items())
+        ]
+        self.persisted = {module_name: row for module_name, row in self.persisted.items() if module_name in self.files}
+        rows = [row for row in rows if self.persisted.get(row["module"]) != row]
+        if not rows:
+            return 0
+        # A fresh process has nothing cached, so the store skips values it already holds
+        session.run(
+            "UNWIND $rows AS row "
+            "MATCH (file:File {path: row.path}) "
+            "WHERE [file.module, coalesce(file.import_layer, -1), coalesce(file.import_cycle, -1), "
+            "file.import_count, file.importer_count] <> "
+            "[row.module, coalesce(row.layer, -1), coalesce(row.cycle, -1), row.imports, row.importers] "
+            "OR file.import_count IS NULL "
+            "SET file.module = row.module, file.import_layer = row.layer, file.import_cycle = row.cycle, "
+            "file.import_count = row.imports, file.importer_count = row.importers",
+            rows=rows
+        )
+        for row in rows:
+            self.persisted[row["module"]] = row
+        return len(rows)
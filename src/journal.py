@@ -0,0 +1,196 @@
+import json
+import os
+import re
+
+# Statements containing one of these are journaled; anything else is a read
+WRITE_KEYWORDS = re.compile(r"\b(MERGE|CREATE|SET|DELETE|REMOVE)\b", re.IGNORECASE)
+# Statements that remove data; replay never reorders writes across them
+BARRIER_KEYWORDS = re.compile(r"\b(DELETE|REMOVE)\b", re.IGNORECASE)
+# Duplicates of statements containing these cannot be dropped; pure MERGEs can.
+# A repeated MATCH ... MERGE may succeed where the first copy matched nothing.
+NON_COALESCABLE_KEYWORDS = re.compile(r"\b(MATCH|CREATE|SET|DELETE|REMOVE)\b", re.IGNORECASE)
+# Index and constraint statements cannot run inside an UNWIND, so they are not journaled
+SCHEMA_STATEMENT = re.compile(r"^\s*(CREATE|DROP)\s+(\w+\s+)?(INDEX|CONSTRAINT)\b", re.IGNORECASE)
+PARAMETER = re.compile(r"\$(\w+)")
+# Sealed segments end in .jsonl; the one being written ends in .jsonl.open
+SEGMENT_NAME = re.compile(r"^segment-(\d{6})\.jsonl(\.open)?$")
+
+
+class JournalResult:
+    """
+    Stand-in for a driver result: journaled statements return no records.
+    """
+
+    def __iter__(self):
+        return iter(())
+
+    def single(self):
+        return None
+
+    def data(self) -> list:
+        return []
+
+
+class WriteJournal:
+    """
+    Append-only, segment-rotated log of write statements.
+
+    Exposes the same ``session()`` / ``run()`` surface as the Neo4j driver so a
+    CodebaseParser can write to it while the database is unavailable. Read
+    statements are not recorded and return empty results; schema statements
+    are refused and must be run against the store itself.
+    """
+
+    def __init__(self, journal_dir: str, segment_size: int=64 * 1024 * 1024) -> None:
+        self.journal_dir = journal_dir
+        self.segment_size = segment_size
+        os.makedirs(journal_dir, exist_ok=True)
+        last_number = 0
+        for number, path, sealed in scan_segments(journal_dir):
+            if not sealed:
+                # Left open by a writer that died; seal it so it can be replayed
+                os.replace(path, segment_path(journal_dir, number))
+            last_number = number
+        # Never append to an existing segment: always start a new one
+        self.segment_number = last_number + 1
+        self.file = None
+
+    def session(self, **kwargs) -> "WriteJournal":
+        return self
+
+    def __enter__(self) -> "WriteJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.file is not None:
+            self.file.flush()
+
+    def run(self, query: str, parameters: dict=None, **kwargs) -> JournalResult:
+        if SCHEMA_STATEMENT.search(query):
+            raise ValueError("schema statements cannot be journaled; run them against the store")
+        if WRITE_KEYWORDS.search(query):
+            params = {**(parameters or {}), **kwargs}
+            self.append(json.dumps({"q": query, "p": params}, default=str))
+        return JournalResult()
+
+    def append(self, line: str) -> None:
+        if self.file is None:
+            path = segment_path(self.journal_dir, self.segment_number)
+            self.file = open(path + ".open", 'a', encoding="utf-8")
+        self.file.write(line)
+        self.file.write("\n")
+        if self.file.tell() >= self.segment_size:
+            self.rotate()
+
+    def rotate(self) -> None:
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.file = None
+            path = segment_path(self.journal_dir, self.segment_number)
+            os.replace(path + ".open", path)
+            self.segment_number += 1
+
+    def close(self) -> None:
+        self.rotate()
+
+
+def segment_path(journal_dir: str, number: int) -> str:
+    return os.path.join(journal_dir, f"segment-{number:06d}.jsonl")
+
+
+def scan_segments(journal_dir: str) -> list:
+    """
+    Returns (number, path, sealed) for every journal segment, oldest first.
+    """
+    segments = []
+    for name in os.listdir(journal_dir):
+        match = SEGMENT_NAME.match(name)
+        if match:
+            segments.append((int(match.group(1)), os.path.join(journal_dir, name), match.group(2) is None))
+    return sorted(segments)
+
+
+def list_segments(journal_dir: str) -> list:
+    """
+    Returns (number, path) for every sealed journal segment, oldest first.
+    """
+    return [(number, path) for number, path, sealed in scan_segments(journal_dir) if sealed]
+
+
+def batch_query(query: str) -> str:
+    """
+    Rewrites a parameterised statement to run once per row of ``$batch``.
+    """
+    return "UNWIND $batch AS _journal_row " + PARAMETER.sub(r"_journal_row.\1", query)
+
+
+class JournalReplayer:
+    """
+    Streams journal segments into the store in large batches.
+
+    Consecutive runs of the same statement text are sent as a single UNWIND
+    statement. Runs are never merged across a different statement, since a
+    later MATCH may depend on nodes an earlier MERGE creates. Exact duplicates
+    of MERGE-only statements without a MATCH are dropped until the next
+    destructive statement.
+    Only sealed segments are replayed, and each is deleted once it has been
+    fully applied, so an interrupted replay resumes from the first one that
+    was not.
+    """
+
+    def __init__(self, journal_dir: str, batch_size: int=5000, max_pending: int=100000) -> None:
+        self.journal_dir = journal_dir
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.stats = {"journaled": 0, "coalesced": 0, "statements": 0}
+
+    def replay(self, driver) -> dict:
+        with driver.session() as session:
+            for number, path in list_segments(self.journal_dir):
+                self.replay_segment(session, path)
+                os.remove(path)
+        return self.stats
+
+    def replay_segment(self, session, path: str) -> None:
+        # Ordered (query, rows) runs; a row only joins the last run
+        pending: list = []
+        seen: set = set()
+        count = 0
+        with open(path, 'r', encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # A torn final write from a crash; the statement never completed
+                    break
+                entry = json.loads(line)
+                query, params = entry["q"], entry["p"]
+                self.stats["journaled"] += 1
+
+                if BARRIER_KEYWORDS.search(query):
+                    # A MERGE repeated after a delete may recreate what it removed
+                    seen.clear()
+                elif not NON_COALESCABLE_KEYWORDS.search(query):
+                    fingerprint = (query, json.dumps(params, sort_keys=True))
+                    if fingerprint in seen:
+                        self.stats["coalesced"] += 1
+                        continue
+                    seen.add(fingerprint)
+
+                if pending and pending[-1][0] == query:
+                    pending[-1][1].append(params)
+                else:
+                    pending.append((query, [params]))
+                count += 1
+                if count >= self.max_pending:
+                    self.flush(session, pending)
+                    count = 0
+        self.flush(session, pending)
+
+    def flush(self, session, pending: list) -> None:
+        for query, rows in pending:
+            unwind = batch_query(query)
+            for start in range(0, len(rows), self.batch_size):
+                session.run(unwind, batch=rows[start:start + self.batch_size])
+                self.stats["statements"] += 1
+        pending.clear()
@@ -0,0 +1,28 @@
+# Per-symbol metrics recorded on nodes during extraction
+FUNCTION_METRICS = ("loc", "complexity", "nesting_depth", "param_count")
+CLASS_METRICS = ("loc", "method_count", "attribute_count")
+# Metrics that depend on other files and are filled in after linking
+DERIVED_PROPERTIES = ("fan_in", "fan_out")
+
+
+def compute_fan_metrics(session) -> None:
+    """
+    Stores fan_in and fan_out on every Function node in one bulk pass over the
+    CALLS relationships, once all files have been linked.
+    """
+    session.run(
+        "MATCH (function:Function) "
+        "SET function.fan_in = COUNT { (function)<-[:CALLS]-() }, "
+        "function.fan_out = COUNT { (function)-[:CALLS]->() }"
+    )
+
+
+def ensure_metric_indexes(session) -> None:
+    """
+    Creates range indexes so dashboards can filter and sort on metrics.
+    """
+    for label, properties in (("Function", FUNCTION_METRICS + DERIVED_PROPERTIES), ("Class", CLASS_METRICS)):
+        for name in properties:
+            session.run(
+                f"CREATE INDEX {label.lower()}_{name} IF NOT EXISTS FOR (n:{label}) ON (n.{name})"
+            )
@@ -0,0 +1,203 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class NullProfiler:
+    """
+    Profiler stand-in used when profiling is off; every hook is a no-op.
+    """
+    enabled = False
+
+    @contextmanager
+    def file(self, file_path: str):
+        yield
+
+    @contextmanager
+    def stage(self, name: str):
+        yield
+
+    def wrap_session(self, session):
+        return session
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stack of one thread at a fixed interval and counts collapsed
+    stacks ("outer;inner;leaf") for flame graph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float=0.005) -> None:
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: dict = {}
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if frames:
+                stack = ";".join(reversed(frames))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+
+class ProfilingSession:
+    """
+    Wraps a driver session and attributes the time of each run() to its query
+    text and to the file being processed.
+    """
+
+    def __init__(self, session, profiler: "IngestProfiler") -> None:
+        self.session = session
+        self.profiler = profiler
+
+    def run(self, query: str, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.session.run(query, *args, **kwargs)
+        finally:
+            self.profiler.record_query(query, time.perf_counter() - start)
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+
+class IngestProfiler:
+    """
+    Opt-in ingest profiler.
+
+    Runs the whole ingest under cProfile and a stack sampler, and attributes
+    wall time, per-stage time and peak traced memory to individual files and
+    query templates. ``write_report`` produces a top-N slowest files report,
+    a JSON dump, a pstats file and collapsed stacks for flame graphs.
+    """
+    enabled = True
+
+    def __init__(self, output_dir: str, top_n: int=20, sample_interval: float=0.005) -> None:
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.files: dict = {}
+        self.queries: dict = {}
+        self.current_file = None
+        self.cprofile = cProfile.Profile()
+        self.sampler = None
+        self.started_at = None
+        self.wall_time = 0.0
+
+    @contextmanager
+    def run(self):
+        """
+        Profiles everything executed inside the block.
+        """
+        tracemalloc.start()
+        self.sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        self.sampler.start()
+        self.started_at = time.perf_counter()
+        self.cprofile.enable()
+        try:
+            yield self
+        finally:
+            self.cprofile.disable()
+            self.wall_time = time.perf_counter() - self.started_at
+            self.sampler.stop()
+            tracemalloc.stop()
+
+    @contextmanager
+    def file(self, file_path: str):
+        entry = self.files.setdefault(file_path, {
+            "wall": 0.0, "peak_memory": 0, "stages": {}, "queries": 0, "query_time": 0.0,
+        })
+        previous = self.current_file
+        self.current_file = entry
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry["wall"] += time.perf_counter() - start
+            if tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                entry["peak_memory"] = max(entry["peak_memory"], peak)
+            self.current_file = previous
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current_file is not None:
+                stages = self.current_file["stages"]
+                stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+    def wrap_session(self, session):
+        return ProfilingSession(session, self)
+
+    def record_query(self, query: str, elapsed: float) -> None:
+        template = " ".join(query.split())
+        entry = self.queries.setdefault(template, {"calls": 0, "time": 0.0})
+        entry["calls"] += 1
+        entry["time"] += elapsed
+        if self.current_file is not None:
+            self.current_file["queries"] += 1
+            self.current_file["query_time"] += elapsed
+
+    def slowest_files(self) -> list:
+        return sorted(self.files.items(), key=lambda item: item[1]["wall"], reverse=True)[:self.top_n]
+
+    def slowest_queries(self) -> list:
+        return sorted(self.queries.items(), key=lambda item: item[1]["time"], reverse=True)[:self.top_n]
+
+    def write_report(self) -> str:
+        """
+        Writes report.txt, profile.json, ingest.prof and stacks.collapsed to
+        the output directory and returns the path of the text report.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.cprofile.dump_stats(os.path.join(self.output_dir, "ingest.prof"))
+
+        with open(os.path.join(self.output_dir, "stacks.collapsed"), 'w', encoding="utf-8") as f:
+            for stack, count in sorted(self.sampler.stacks.items() if self.sampler else ()):
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(self.output_dir, "profile.json"), 'w', encoding="utf-8") as f:
+            json.dump({"wall_time": self.wall_time, "files": self.files, "queries": self.queries}, f, indent=2)
+
+        lines = [f"Total wall time: {self.wall_time:.3f}s over {len(self.files)} files", ""]
+        lines.append(f"Top {self.top_n} slowest files:")
+        lines.append(f"{'wall (s)':>10} {'peak MiB':>9} {'queries':>8} {'query (s)':>10}  file / stages")
+        for file_path, entry in self.slowest_files():
+            stages = ", ".join(f"{name}={seconds:.3f}s" for name, seconds in sorted(entry["stages"].items()))
+            lines.append(
+                f"{entry['wall']:>10.3f} {entry['peak_memory'] / 1048576:>9.2f} "
+                f"{entry['queries']:>8} {entry['query_time']:>10.3f}  {file_path}"
+            )
+            if stages:
+                lines.append(f"{'':>41}  {stages}")
+        lines.append("")
+        lines.append(f"Top {self.top_n} query templates by total time:")
+        for template, entry in self.slowest_queries():
+            lines.append(f"{entry['time']:>10.3f}s {entry['calls']:>8} calls  {template}")
+
+        report_path = os.path.join(self.output_dir, "report.txt")
+        with open(report_path, 'w', encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return report_path
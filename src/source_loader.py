@@ -0,0 +1,262 @@
+import ast
+import io
+import multiprocessing
+import os
+import stat
+import time
+import tokenize
+from collections import deque
+from multiprocessing.connection import wait
+from src.extraction import FileFacts, extract_facts
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_MAX_LINES = 50000
+DEFAULT_TIMEOUT = 10.0
+
+
+class SourceError(Exception):
+    """
+    Raised when a file is skipped (over a limit) or cannot be decoded or parsed.
+    `status` is "skipped", "failed" or "timeout".
+    """
+
+    def __init__(self, status: str, reason: str) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+def annotated_facts(file_path: str, status: str, reason: str) -> FileFacts:
+    """
+    Returns facts holding only the File node, annotated with why the file
+    was not indexed, so the graph still records that it exists.
+    """
+    facts = FileFacts(file_path)
+    facts.add_node("File", file_path, load_status=status, load_error=reason)
+    return facts
+
+
+def read_source(file_path: str, max_bytes: int=DEFAULT_MAX_BYTES, max_lines: int=DEFAULT_MAX_LINES) -> bytes:
+    """
+    Reads a Python file as bytes, once, after checking its size. Rejects
+    files over the line limit and files that do not decode with their PEP 263
+    encoding (UTF-8 when there is no cookie).
+    """
+    try:
+        size = os.stat(file_path).st_size
+        if max_bytes and size > max_bytes:
+            raise SourceError("skipped", f"{size} bytes exceeds the {max_bytes} byte limit")
+        with open(file_path, 'rb') as f:
+            source: bytes = f.read(max_bytes + 1 if max_bytes else -1)
+    except OSError as e:
+        raise SourceError("failed", f"cannot read file: {e.strerror or e}") from e
+    if max_bytes and len(source) > max_bytes:
+        # The file grew between stat() and read()
+        raise SourceError("skipped", f"more than {max_bytes} bytes exceeds the byte limit")
+
+    lines = source.count(b"\n")
+    if max_lines and lines > max_lines:
+        raise SourceError("skipped", f"{lines} lines exceeds the {max_lines} line limit")
+
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+        source.decode(encoding)
+    except SyntaxError as e:
+        raise SourceError("failed", f"cannot determine the source encoding: {e}") from e
+    except UnicodeDecodeError as e:
+        raise SourceError("failed", f"cannot decode as {encoding}: {e.reason} at byte {e.start}") from e
+    return source
+
+
+def parse_source(source: bytes, file_path: str) -> ast.AST:
+    """
+    Parses raw source bytes; ast honours the encoding cookie itself.
+    """
+    try:
+        return ast.parse(source, filename=file_path)
+    except SyntaxError as e:
+        raise SourceError("failed", f"syntax error: {e.msg} (line {e.lineno})") from e
+    except (ValueError, RecursionError, MemoryError) as e:
+        raise SourceError("failed", f"cannot parse: {e}") from e
+
+
+def load_facts(file_path: str, max_bytes: int=DEFAULT_MAX_BYTES, max_lines: int=DEFAULT_MAX_LINES) -> FileFacts:
+    """
+    Reads, parses and extracts one file. Never raises for a bad file: it
+    returns annotated File-only facts instead.
+    """
+    try:
+        source = read_source(file_path, max_bytes, max_lines)
+        return extract_facts(parse_source(source, file_path), file_path, source)
+    except SourceError as e:
+        return annotated_facts(file_path, e.status, e.reason)
+    except Exception as e:
+        return annotated_facts(file_path, "failed", f"extraction error: {type(e).__name__}: {e}")
+
+
+def worker_main(connection, max_bytes: int, max_lines: int) -> None:
+    """
+    Answers each file path sent over `connection` with its FileFacts as a
+    dict, until it receives None.
+    """
+    while True:
+        try:
+            file_path = connection.recv()
+        except EOFError:
+            # The parent closed the pipe without a shutdown request
+            return
+        if file_path is None:
+            return
+        connection.send(load_facts(file_path, max_bytes, max_lines).to_dict())
+
+
+class LoaderWorker:
+    """
+    One worker process and the file it is currently loading.
+    """
+
+    def __init__(self, context, max_bytes: int, max_lines: int) -> None:
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child, max_bytes, max_lines), daemon=True)
+        self.process.start()
+        child.close()
+        self.file_path = None
+        self.deadline = None
+
+    def submit(self, file_path: str, timeout: float) -> None:
+        self.connection.send(file_path)
+        self.file_path = file_path
+        self.deadline = time.monotonic() + timeout
+
+    def stop(self) -> None:
+        if self.process.is_alive() and self.file_path is None:
+            try:
+                self.connection.send(None)
+                self.process.join(1)
+            except OSError:
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class SourceLoader:
+    """
+    Bounded, fault-tolerant source loading.
+
+    Files over the size or line limits are skipped without being parsed, and
+    undecodable or unparsable files are recorded rather than raised. With
+    ``load`` and ``load_many`` every file is parsed and extracted in a worker
+    process that is killed and replaced when it exceeds the per-file timeout,
+    so one pathological file cannot stall an ingest. ``read_and_parse`` hands
+    back the tree itself, so it parses in-process, bounded by the limits alone.
+    """
+
+    def __init__(self, max_bytes: int=DEFAULT_MAX_BYTES, max_lines: int=DEFAULT_MAX_LINES,
+                 timeout: float=DEFAULT_TIMEOUT, workers: int=None) -> None:
+        self.max_bytes = max_bytes
+        self.max_lines = max_lines
+        self.timeout = timeout
+        self.workers = workers or os.cpu_count() or 1
+        # Spawned rather than forked, since the parent may hold driver threads and locks
+        self.context = multiprocessing.get_context("spawn")
+        # Long-lived worker serving one-file requests, started on first use
+        self.worker = None
+
+    def request(self, file_path: str) -> dict:
+        """
+        Loads one file on the single-file worker, raising SourceError when it
+        times out or the worker dies. A stuck worker is killed.
+        """
+        if self.worker is None:
+            self.worker = self.new_worker()
+        worker = self.worker
+        worker.submit(file_path, self.timeout)
+        try:
+            if worker.connection.poll(self.timeout):
+                response = worker.connection.recv()
+                worker.file_path = None
+                return response
+            error = SourceError("timeout", f"parsing took longer than {self.timeout}s")
+        except (EOFError, OSError):
+            error = SourceError("failed", "worker process exited")
+        # The worker is stuck or dead; the next request starts a new one
+        self.worker = None
+        worker.stop()
+        raise error
+
+    def read_and_parse(self, file_path: str) -> tuple:
+        """
+        Returns (source, tree) for one file. Parsed in this process, where
+        pickling the tree back from a worker would cost more than the parse
+        and hide it from the profiler. Raises SourceError.
+        """
+        try:
+            mode = os.stat(file_path).st_mode
+        except OSError as e:
+            raise SourceError("failed", f"cannot read file: {e.strerror or e}") from e
+        if not stat.S_ISREG(mode):
+            # Reading a FIFO or device could block forever, with no worker timeout to end it
+            raise SourceError("skipped", "not a regular file")
+        source = read_source(file_path, self.max_bytes, self.max_lines)
+        return source, parse_source(source, file_path)
+
+    def load(self, file_path: str) -> FileFacts:
+        """
+        Returns the FileFacts of one file, loaded in the worker process within
+        the timeout; failures come back as annotated File-only facts.
+        """
+        try:
+            return FileFacts.from_dict(self.request(file_path))
+        except SourceError as e:
+            return annotated_facts(file_path, e.status, e.reason)
+
+    def close(self) -> None:
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+    def load_many(self, file_paths):
+        """
+        Yields the FileFacts of every path, in completion order. Files that
+        were skipped, failed, timed out or crashed their worker come back as
+        annotated File-only facts.
+        """
+        queue = deque(file_paths)
+        workers = [self.new_worker() for _ in range(min(self.workers, len(queue)))]
+        try:
+            for worker in workers:
+                worker.submit(queue.popleft(), self.timeout)
+            while any(worker.file_path for worker in workers):
+                busy = [worker for worker in workers if worker.file_path]
+                remaining = max(0.0, min(worker.deadline for worker in busy) - time.monotonic())
+                ready = wait([worker.connection for worker in busy], remaining)
+                for position, worker in enumerate(workers):
+                    if worker.file_path is None:
+                        continue
+                    if worker.connection in ready:
+                        try:
+                            facts = FileFacts.from_dict(worker.connection.recv())
+                        except (EOFError, OSError):
+                            facts = annotated_facts(worker.file_path, "failed", "worker process exited")
+                            worker.file_path = None
+                            worker.stop()
+                            worker = workers[position] = self.new_worker()
+                    elif time.monotonic() >= worker.deadline:
+                        facts = annotated_facts(worker.file_path, "timeout",
+                                                f"parsing took longer than {self.timeout}s")
+                        worker.stop()
+                        worker = workers[position] = self.new_worker()
+                    else:
+                        continue
+                    worker.file_path = None
+                    if queue:
+                        worker.submit(queue.popleft(), self.timeout)
+                    yield facts
+        finally:
+            for worker in workers:
+                worker.stop()
+
+    def new_worker(self) -> LoaderWorker:
+        return LoaderWorker(self.context, self.max_bytes, self.max_lines)
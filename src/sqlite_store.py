@@ -0,0 +1,243 @@
+import json
+import os
+import sqlite3
+from src.extraction import SHARED_LABELS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    file TEXT NOT NULL,
+    name TEXT,
+    props TEXT NOT NULL DEFAULT '{}',
+    UNIQUE (label, qualname, file)
+);
+CREATE INDEX IF NOT EXISTS nodes_name ON nodes (name, label);
+CREATE INDEX IF NOT EXISTS nodes_qualname ON nodes (qualname, label);
+CREATE INDEX IF NOT EXISTS nodes_file ON nodes (file);
+CREATE TABLE IF NOT EXISTS edges (
+    src INTEGER NOT NULL REFERENCES nodes (id) ON DELETE CASCADE,
+    rel TEXT NOT NULL,
+    dst INTEGER NOT NULL REFERENCES nodes (id) ON DELETE CASCADE,
+    owner TEXT NOT NULL,
+    PRIMARY KEY (src, rel, dst)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_reverse ON edges (dst, rel, src);
+CREATE INDEX IF NOT EXISTS edges_owner ON edges (owner);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Walks CALLS edges from the start symbols in either direction up to a depth
+REACH_QUERY = """
+WITH RECURSIVE reach(id, depth) AS (
+    SELECT id, 0 FROM nodes WHERE label = 'Function' AND (qualname = :symbol OR name = :symbol)
+    UNION
+    SELECT edges.{next}, reach.depth + 1
+    FROM edges JOIN reach ON edges.{current} = reach.id
+    WHERE edges.rel = 'CALLS' AND reach.depth < :depth
+)
+SELECT nodes.label, nodes.qualname, nodes.file, nodes.props, MIN(reach.depth) AS depth
+FROM reach JOIN nodes ON nodes.id = reach.id
+WHERE reach.depth > 0
+GROUP BY nodes.id
+ORDER BY depth, nodes.file, nodes.qualname
+"""
+
+
+class SQLiteGraphStore:
+    """
+    Embedded, single-file graph store for one codebase.
+
+    Nodes and edges from FileFacts go into indexed tables; the file runs in
+    WAL mode so readers never block the writer. Each file's facts are
+    replaced in one transaction, and traversals are recursive CTEs.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SQLiteGraphStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def load(self, facts_list) -> int:
+        """
+        Replaces the stored facts of every file in `facts_list` inside a single
+        transaction. Returns the number of files written.
+        """
+        count = 0
+        with self.connection:
+            for facts in facts_list:
+                self._replace(facts)
+                count += 1
+        return count
+
+    def replace_file(self, facts) -> None:
+        with self.connection:
+            self._replace(facts)
+
+    def remove_file(self, file_path: str) -> None:
+        with self.connection:
+            self._remove(file_path)
+
+    def _remove(self, file_path: str) -> None:
+        # Edges owned by the file go first; its nodes then cascade the rest
+        self.connection.execute("DELETE FROM edges WHERE owner = ?", (file_path,))
+        self.connection.execute("DELETE FROM nodes WHERE file = ?", (file_path,))
+        self.connection.execute("DELETE FROM files WHERE path = ?", (file_path,))
+
+    def _replace(self, facts) -> None:
+        self._remove(facts.file_path)
+        cursor = self.connection.cursor()
+        if os.path.isfile(facts.file_path):
+            stat = os.stat(facts.file_path)
+            cursor.execute("INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)",
+                           (facts.file_path, stat.st_mtime, stat.st_size))
+        cursor.executemany(
+            "INSERT INTO nodes (label, qualname, file, name, props) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (label, qualname, file) DO UPDATE SET props = excluded.props",
+            [
+                (label, qualname, file_path, props.get("name", qualname), json.dumps(props))
+                for (label, qualname, file_path), props in facts.nodes.items()
+            ]
+        )
+        ids = {
+            (label, qualname, file_path): node_id for node_id, label, qualname, file_path in cursor.execute(
+                "SELECT id, label, qualname, file FROM nodes WHERE file = ?", (facts.file_path,)
+            )
+        }
+        for key in facts.nodes:
+            if key[0] in SHARED_LABELS:
+                ids[key] = cursor.execute(
+                    "SELECT id FROM nodes WHERE label = ? AND qualname = ? AND file = ?", key
+                ).fetchone()[0]
+        cursor.executemany(
+            "INSERT OR IGNORE INTO edges (src, rel, dst, owner) VALUES (?, ?, ?, ?)",
+            [
+                (ids[src], rel, ids[dst], facts.file_path)
+                for src, rel, dst in facts.edges if src in ids and dst in ids
+            ]
+        )
+
+    def indexed_files(self) -> dict:
+        """
+        Returns {path: (mtime, size)} for every file as it was when last stored.
+        """
+        return {path: (mtime, size) for path, mtime, size in self.connection.execute("SELECT * FROM files")}
+
+    def changed_files(self, file_paths) -> list:
+        """
+        Returns the paths in `file_paths` that are new or were modified since
+        they were last stored.
+        """
+        indexed = self.indexed_files()
+        changed = []
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            if indexed.get(file_path) != (stat.st_mtime, stat.st_size):
+                changed.append(file_path)
+        return changed
+
+    def remove_orphan_shared_nodes(self) -> int:
+        """
+        Deletes module and directory nodes that no edge refers to any more.
+        """
+        placeholders = ", ".join("?" for _ in SHARED_LABELS)
+        with self.connection:
+            cursor = self.connection.execute(
+                f"DELETE FROM nodes WHERE label IN ({placeholders}) "
+                f"AND NOT EXISTS (SELECT 1 FROM edges WHERE edges.dst = nodes.id) "
+                f"AND NOT EXISTS (SELECT 1 FROM edges WHERE edges.src = nodes.id)",
+                SHARED_LABELS
+            )
+        return cursor.rowcount
+
+    def _reach(self, symbol: str, depth: int, reverse: bool) -> list:
+        query = REACH_QUERY.format(next="src" if reverse else "dst", current="dst" if reverse else "src")
+        rows = self.connection.execute(query, {"symbol": symbol, "depth": depth})
+        return [
+            {"label": label, "qualname": qualname, "file": file_path, "depth": distance, **json.loads(props)}
+            for label, qualname, file_path, props, distance in rows
+        ]
+
+    def callers(self, symbol: str, depth: int=1) -> list:
+        """
+        Returns the functions that call `symbol` (qualified or plain name),
+        directly or through up to `depth` calls.
+        """
+        return self._reach(symbol, depth, reverse=True)
+
+    def callees(self, symbol: str, depth: int=1) -> list:
+        """
+        Returns the functions `symbol` calls, directly or through up to `depth` calls.
+        """
+        return self._reach(symbol, depth, reverse=False)
+
+    def importers(self, module_name: str) -> list:
+        """
+        Returns the files importing `module_name` or anything inside it.
+        """
+        rows = self.connection.execute(
+            "SELECT DISTINCT files.qualname FROM nodes AS modules "
+            "JOIN edges ON edges.dst = modules.id AND edges.rel = 'IMPORTS' "
+            "JOIN nodes AS files ON files.id = edges.src "
+            "WHERE modules.label = 'Module' AND (modules.qualname = ? OR modules.qualname LIKE ? ESCAPE '\\') "
+            "ORDER BY files.qualname",
+            (module_name, module_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + ".%")
+        )
+        return [row[0] for row in rows]
+
+    def find(self, name: str, label: str=None) -> list:
+        """
+        Returns the nodes whose name or qualified name is `name`.
+        """
+        query = "SELECT label, qualname, file, props FROM nodes WHERE (name = ? OR qualname = ?)"
+        params = [name, name]
+        if label:
+            query += " AND label = ?"
+            params.append(label)
+        rows = self.connection.execute(query + " ORDER BY file, qualname", params)
+        return [
+            {"label": label, "qualname": qualname, "file": file_path, **json.loads(props)}
+            for label, qualname, file_path, props in rows
+        ]
+
+    def iter_records(self):
+        """
+        Yields ("node", record) and ("edge", record) tuples in the format of
+        src.graph_export, so the stored graph can be exported without Neo4j.
+        """
+        from src.extraction import node_identity
+        from src.graph_export import node_id
+        for label, qualname, file_path, props in self.connection.execute(
+            "SELECT label, qualname, file, props FROM nodes ORDER BY id"
+        ):
+            key = (label, qualname, file_path)
+            yield "node", {"id": node_id(key), "labels": [label], "props": {**node_identity(key), **json.loads(props)}}
+        rows = self.connection.execute(
+            "SELECT a.label, a.qualname, a.file, edges.rel, b.label, b.qualname, b.file "
+            "FROM edges JOIN nodes AS a ON a.id = edges.src JOIN nodes AS b ON b.id = edges.dst "
+            "ORDER BY edges.src, edges.rel, edges.dst"
+        )
+        for row in rows:
+            yield "edge", {"source": node_id(row[0:3]), "target": node_id(row[4:7]), "type": row[3], "props": {}}
+
+    def counts(self) -> dict:
+        nodes = self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+        edges = self.connection.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+        return {"nodes": nodes, "edges": edges}
@@ -0,0 +1,203 @@
+import json
+import os
+from collections import Counter
+
+# Labels of the nodes that are searchable by name
+SYMBOL_LABELS = ("Function", "Class", "Variable")
+# Fuzzy matching reads posting lists, rarest first, until it has seen this many
+# entries, then scores only the candidates sharing the most trigrams among them
+MAX_FUZZY_POSTINGS = 4000
+MAX_FUZZY_CANDIDATES = 200
+
+
+def trigrams(text: str) -> set:
+    """
+    Returns the trigrams of a lowercased, space padded string.
+    """
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolIndex:
+    """
+    Prefix trie plus trigram index over symbol names and qualified names.
+
+    Exact and prefix matches come from the trie; fuzzy matches are scored by
+    trigram similarity. The index is updated per file and persisted as JSON.
+    """
+
+    def __init__(self) -> None:
+        self.symbols: dict = {}
+        self.file_symbols: dict = {}
+        self.trie: dict = {}
+        self.trigram_index: dict = {}
+        # symbol id -> number of trigrams in its name, for scoring
+        self.gram_counts: dict = {}
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def update_file(self, facts) -> None:
+        """
+        Replaces every symbol of `facts.file_path` with the ones in `facts`.
+        """
+        self.remove_file(facts.file_path)
+        for key, props in facts.nodes.items():
+            if key[0] in SYMBOL_LABELS:
+                self.add_symbol(key[0], props.get("name", key[1].rpartition(".")[2]), key[1], key[2],
+                                props.get("lineno"))
+
+    def remove_file(self, file_path: str) -> None:
+        for symbol_id in self.file_symbols.pop(file_path, ()):
+            symbol = self.symbols.pop(symbol_id)
+            del self.gram_counts[symbol_id]
+            for term in self.terms(symbol):
+                self.trie_remove(term, symbol_id)
+            for gram in trigrams(symbol["name"]):
+                ids = self.trigram_index.get(gram)
+                if ids is not None:
+                    ids.discard(symbol_id)
+                    if not ids:
+                        del self.trigram_index[gram]
+
+    def add_symbol(self, label: str, name: str, qualname: str, file_path: str, lineno: int=None) -> int:
+        symbol_id = self.next_id
+        self.next_id += 1
+        symbol = {"label": label, "name": name, "qualname": qualname, "file": file_path, "lineno": lineno}
+        self.symbols[symbol_id] = symbol
+        self.file_symbols.setdefault(file_path, set()).add(symbol_id)
+        for term in self.terms(symbol):
+            self.trie_insert(term, symbol_id)
+        name_grams = trigrams(name)
+        for gram in name_grams:
+            self.trigram_index.setdefault(gram, set()).add(symbol_id)
+        self.gram_counts[symbol_id] = len(name_grams)
+        return symbol_id
+
+    @staticmethod
+    def terms(symbol: dict) -> set:
+        return {symbol["name"].lower(), symbol["qualname"].lower()}
+
+    def trie_insert(self, term: str, symbol_id: int) -> None:
+        node = self.trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node.setdefault("", set()).add(symbol_id)
+
+    def trie_remove(self, term: str, symbol_id: int) -> None:
+        path = [self.trie]
+        for char in term:
+            node = path[-1].get(char)
+            if node is None:
+                return
+            path.append(node)
+        ids = path[-1].get("")
+        if ids is None:
+            return
+        ids.discard(symbol_id)
+        if not ids:
+            del path[-1][""]
+        # Prune branches that no longer lead to any symbol
+        for depth in range(len(term), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][term[depth - 1]]
+
+    def prefix_matches(self, prefix: str, limit: int) -> list:
+        """
+        Returns up to `limit` (symbol_id, matched_term_length) pairs whose name
+        or qualified name starts with `prefix`, shortest terms first.
+        """
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        matches = []
+        seen: set = set()
+        level = [(node, len(prefix))]
+        while level and len(matches) < limit:
+            next_level = []
+            for current, length in level:
+                for symbol_id in sorted(current.get("", ())):
+                    if symbol_id not in seen:
+                        seen.add(symbol_id)
+                        matches.append((symbol_id, length))
+                for char, child in current.items():
+                    if char:
+                        next_level.append((child, length + 1))
+            level = next_level
+        return matches[:limit]
+
+    def fuzzy_matches(self, query: str) -> list:
+        """
+        Returns (symbol_id, score) pairs for names sharing at least half of the
+        query's trigrams, scored by half the Dice coefficient so they always
+        rank below prefix matches. Shared trigrams are counted from the posting
+        lists, and at most MAX_FUZZY_CANDIDATES names are scored.
+        """
+        # A trailing pad would only match names that end where the query does
+        query_grams = {gram for gram in trigrams(query) if not gram.endswith(" ")}
+        min_shared = max(1, (len(query_grams) + 1) // 2)
+        # Any name sharing min_shared trigrams must contain one of the rarest
+        # len - min_shared + 1, so at most those posting lists are scanned
+        postings = sorted((self.trigram_index.get(gram, set()) for gram in query_grams), key=len)
+        split = len(postings) - min_shared + 1
+        scanned = read = 0
+        rare_counts: Counter = Counter()
+        while scanned < split and (scanned == 0 or read + len(postings[scanned]) <= MAX_FUZZY_POSTINGS):
+            rare_counts.update(postings[scanned])
+            read += len(postings[scanned])
+            scanned += 1
+        # The other posting lists are only intersected with the best candidates
+        counts = dict(rare_counts.most_common(MAX_FUZZY_CANDIDATES))
+        candidates = counts.keys()
+        for ids in postings[scanned:]:
+            for symbol_id in candidates & ids:
+                counts[symbol_id] += 1
+
+        return [(symbol_id, shared / (len(query_grams) + self.gram_counts[symbol_id]))
+                for symbol_id, shared in counts.items() if shared >= min_shared]
+
+    def search(self, query: str, limit: int=10) -> list:
+        """
+        Returns up to `limit` symbols matching `query`, best first. Each result
+        is the symbol dict with an added ``score`` between 0 and 1.
+        """
+        query = query.lower()
+        if not query:
+            return []
+
+        scores: dict = {}
+        for symbol_id, length in self.prefix_matches(query, limit):
+            # Exact matches score 1.0, longer completions slightly less
+            scores[symbol_id] = 0.5 + 0.5 * len(query) / length
+
+        # Fuzzy scores stay below 0.5, so they cannot displace a full page of prefix matches
+        if len(query) >= 3 and len(scores) < limit:
+            for symbol_id, score in self.fuzzy_matches(query):
+                if score > scores.get(symbol_id, 0):
+                    scores[symbol_id] = score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.symbols[item[0]]["qualname"]))
+        return [{**self.symbols[symbol_id], "score": round(score, 4)} for symbol_id, score in ranked[:limit]]
+
+    def save(self, path: str) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump(list(self.symbols.values()), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SymbolIndex":
+        index = cls()
+        try:
+            with open(path, 'r', encoding="utf-8") as f:
+                symbols = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return index
+        for symbol in symbols:
+            index.add_symbol(symbol["label"], symbol["name"], symbol["qualname"], symbol["file"], symbol.get("lineno"))
+        return index
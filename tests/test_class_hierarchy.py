@@ -0,0 +1,117 @@
+import ast
+import unittest
+from unittest.mock import MagicMock
+from src.class_hierarchy import ClassHierarchy, c3_merge, C3Error, module_name_for, resolve_relative
+from src.extraction import extract_facts
+
+BASE = '''
+class Base:
+    def run(self):
+        pass
+    def stop(self):
+        pass
+'''
+
+MIXINS = '''
+from .base import Base
+
+class LoggingMixin:
+    def run(self):
+        pass
+
+class Left(Base):
+    def stop(self):
+        pass
+
+class Right(Base):
+    pass
+'''
+
+APP = '''
+import pkg.mixins as mixins
+from pkg.mixins import Left
+
+class App(Left, mixins.Right, Exception):
+    pass
+'''
+
+
+class TestClassHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.hierarchy = ClassHierarchy()
+        self.update("pkg/base.py", BASE)
+        self.update("pkg/mixins.py", MIXINS)
+        self.update("app.py", APP)
+
+    def update(self, file_path: str, code: str) -> set:
+        module_name, is_package = module_name_for(file_path)
+        facts = extract_facts(ast.parse(code), file_path)
+        return self.hierarchy.update_file(facts, module_name, is_package)
+
+    def test_module_names(self):
+        self.assertEqual(module_name_for("root/pkg/sub/mod.py", "root"), ("pkg.sub.mod", False))
+        self.assertEqual(module_name_for("root/pkg/__init__.py", "root"), ("pkg", True))
+        self.assertEqual(resolve_relative("..base.Base", "pkg.sub.mod", False), "pkg.base.Base")
+        self.assertEqual(resolve_relative(".models", "pkg", True), "pkg.models")
+
+    def test_cross_module_c3_mro(self):
+        self.assertEqual(
+            self.hierarchy.mro["app.App"],
+            ["app.App", "pkg.mixins.Left", "pkg.mixins.Right", "pkg.base.Base", "Exception"]
+        )
+        self.assertEqual(self.hierarchy.subclasses("pkg.base.Base"),
+                         {"pkg.mixins.Left", "pkg.mixins.Right", "app.App"})
+
+    def test_method_resolution(self):
+        self.assertEqual(self.hierarchy.resolve_method("app.App", "stop"), "pkg.mixins.Left")
+        self.assertEqual(self.hierarchy.resolve_method("app.App", "run"), "pkg.base.Base")
+        self.assertIsNone(self.hierarchy.resolve_method("app.App", "missing"))
+
+    def test_incremental_update(self):
+        changed = self.update("pkg/base.py", BASE.replace("def stop", "def halt"))
+        self.assertEqual(changed, {"pkg.base.Base", "pkg.mixins.Left", "pkg.mixins.Right", "app.App"})
+        self.assertEqual(self.hierarchy.resolve_method("pkg.mixins.Right", "halt"), "pkg.base.Base")
+
+        changed = self.update("pkg/mixins.py", MIXINS.replace("class Right(Base)", "class Right(LoggingMixin)"))
+        self.assertEqual(self.hierarchy.resolve_method("pkg.mixins.Right", "run"), "pkg.mixins.LoggingMixin")
+        self.assertIn("app.App", changed)
+        self.assertEqual(
+            self.hierarchy.mro["app.App"],
+            ["app.App", "pkg.mixins.Left", "pkg.base.Base", "pkg.mixins.Right", "pkg.mixins.LoggingMixin", "Exception"]
+        )
+        self.assertEqual(self.hierarchy.subclasses("pkg.base.Base"), {"pkg.mixins.Left", "app.App"})
+
+    def test_update_reports_ancestors_that_lost_descendants(self):
+        self.update("child.py", "from pkg.base import Base\nclass Child(Base):\n    pass\n")
+        self.assertIn("child.Child", self.hierarchy.subclasses("pkg.base.Base"))
+        changed = self.update("child.py", "class Child:\n    pass\n")
+        self.assertEqual(changed, {"child.Child", "pkg.base.Base"})
+        self.assertNotIn("child.Child", self.hierarchy.subclasses("pkg.base.Base"))
+
+    def test_removed_and_restored_base_relinks_subclasses(self):
+        self.update("pkg/base.py", "")
+        self.assertEqual(self.hierarchy.mro["pkg.mixins.Left"], ["pkg.mixins.Left", "Base"])
+        self.assertNotIn("pkg.base.Base", self.hierarchy.children)
+
+        changed = self.update("pkg/base.py", BASE)
+        self.assertTrue({"pkg.mixins.Left", "pkg.mixins.Right", "app.App"} <= changed)
+        self.assertEqual(self.hierarchy.children["pkg.base.Base"], {"pkg.mixins.Left", "pkg.mixins.Right"})
+        self.assertEqual(self.hierarchy.resolve_method("app.App", "run"), "pkg.base.Base")
+
+    def test_inconsistent_mro(self):
+        with self.assertRaises(C3Error):
+            c3_merge([["A", "B"], ["B", "A"]])
+        self.update("bad.py", "class A: pass\nclass B(A): pass\nclass C(A, B): pass\n")
+        self.assertIn("bad.C", self.hierarchy.inconsistent)
+        self.assertEqual(self.hierarchy.mro["bad.C"], ["bad.C", "bad.A", "bad.B"])
+
+    def test_materialize_only_changed_classes(self):
+        session = MagicMock()
+        self.hierarchy.materialize(session, {"pkg.mixins.Left"})
+        rows = session.run.call_args.kwargs["rows"]
+        self.assertEqual([row["class_id"] for row in rows], ["pkg.mixins.Left"])
+        self.assertEqual(rows[0]["targets"], [{"qualname": "Base", "file": "pkg/base.py", "mro_index": 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from src.cli import build_parser, load_config, main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.codebase = os.path.join(self.tmp.name, "code")
+        os.makedirs(os.path.join(self.codebase, "pkg"))
+        self.write("pkg/core.py", "def parse():\n    return tokenize()\n\ndef tokenize():\n    return []\n")
+        self.write("app.py", "from pkg.core import parse\n\ndef main():\n    return parse()\n")
+        self.db = os.path.join(self.tmp.name, "index", "graph.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative: str, code: str) -> None:
+        with open(os.path.join(self.codebase, relative), 'w', encoding="utf-8") as f:
+            f.write(code)
+
+    def run_cli(self, *argv) -> str:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(["--db", self.db, *argv])
+        return output.getvalue()
+
+    def test_config_file_and_flag_precedence(self):
+        config_path = os.path.join(self.tmp.name, "bitgraph.json")
+        with open(config_path, 'w', encoding="utf-8") as f:
+            json.dump({"db": "from-file.db", "neo4j_user": "reader"}, f)
+        args = build_parser().parse_args(["--config", config_path, "--db", "from-flag.db", "query", "find", "x"])
+        config = load_config(args)
+        self.assertEqual(config["db"], "from-flag.db")
+        self.assertEqual(config["neo4j_user"], "reader")
+        self.assertEqual(config["backend"], "sqlite")
+
+    def test_index_update_and_query(self):
+        counts = json.loads(self.run_cli("index", self.codebase))
+        self.assertEqual(counts["files"], 2)
+        self.assertEqual(self.run_cli("query", "callees", "parse").split(), ["tokenize", f"{self.codebase}/pkg/core.py:4"])
+        importers = json.loads(self.run_cli("query", "importers", "pkg", "--json"))
+        self.assertEqual(importers, [{"file": os.path.join(self.codebase, "app.py")}])
+
+        self.assertEqual(json.loads(self.run_cli("update", self.codebase))["files"], 0)
+        os.remove(os.path.join(self.codebase, "app.py"))
+        counts = json.loads(self.run_cli("update", self.codebase))
+        self.assertEqual((counts["files"], counts["removed"]), (0, 1))
+        self.assertEqual(self.run_cli("query", "importers", "pkg"), "")
+
+    def test_index_with_profile(self):
+        profile_dir = os.path.join(self.tmp.name, "profile")
+        with contextlib.redirect_stderr(io.StringIO()):
+            counts = json.loads(self.run_cli("index", self.codebase, "--profile", profile_dir, "--profile-top", "1"))
+        self.assertEqual(counts["files"], 2)
+        with open(os.path.join(profile_dir, "report.txt"), encoding="utf-8") as f:
+            report = f.read()
+        self.assertIn("over 2 files", report)
+        self.assertIn("parse=", report)
+
+    def test_query_refuses_neo4j_backend(self):
+        with self.assertRaises(SystemExit) as raised:
+            self.run_cli("--backend", "neo4j", "query", "find", "parse")
+        self.assertIn("SQLite index only", str(raised.exception))
+
+    def test_export(self):
+        self.run_cli("index", self.codebase)
+        output = os.path.join(self.tmp.name, "export")
+        self.run_cli("export", output)
+        with open(os.path.join(output, "manifest.json"), encoding="utf-8") as f:
+            self.assertGreater(json.load(f)["nodes"], 0)
+
+    def test_query_does_not_load_heavy_modules(self):
+        self.run_cli("index", self.codebase)
+        script = (
+            "import sys; from src.cli import main; "
+            f"main(['--db', {self.db!r}, 'query', 'find', 'parse']); "
+            "print(sorted(m for m in ('neo4j', 'halo', 'pyflakes', 'src.cb_parser3') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.splitlines()[-1], "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
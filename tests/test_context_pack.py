@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from src.context_pack import ContextIndex, SourceReader, context_pack_from_store, ensure_context_indexes
+from src.extraction import extract_file
+
+
+class TestContextPack(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "shapes.py")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(
+                "# café\n"
+                "class Shape:\n"
+                "    sides = 0\n"
+                "\n"
+                "    def area(self):\n"
+                "        return scale(0)\n"
+                "\n"
+                "class Square(Shape):\n"
+                "    pass\n"
+                "\n"
+                "def scale(x):\n"
+                "    return x * 2\n"
+            )
+        self.facts = extract_file(self.file_path)
+        self.index = ContextIndex([self.facts])
+
+    def tearDown(self):
+        self.index.reader.close()
+        self.tmp_dir.cleanup()
+
+    def test_spans_are_recorded(self):
+        props = self.facts.nodes[("Function", "Shape.area", self.file_path)]
+        self.assertEqual((props["lineno"], props["end_lineno"]), (5, 6))
+        self.assertIn("start_byte", props)
+        self.assertIn("end_byte", props)
+
+    def test_snippet_matches_source(self):
+        pack = self.index.context_pack("scale", hops=0)
+        self.assertEqual(len(pack), 1)
+        self.assertEqual(pack[0]["source"], "def scale(x):\n    return x * 2")
+
+    def test_reader_bounds_maps_and_handles_changed_files(self):
+        paths = []
+        for i in range(3):
+            paths.append(os.path.join(self.tmp_dir.name, f"m{i}.py"))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                f.write(f"value = {i}\n")
+        with SourceReader(max_maps=2) as reader:
+            self.assertEqual([reader.snippet(path, 0, 9) for path in paths], ["value = 0", "value = 1", "value = 2"])
+            self.assertEqual(list(reader.maps), paths[1:])
+
+            with open(paths[1], "w", encoding="utf-8") as f:
+                f.write("v = 1\n")
+            self.assertIsNone(reader.snippet(paths[1], 0, 9))
+            self.assertNotIn(paths[1], reader.maps)
+            os.remove(paths[2])
+            self.assertIsNone(reader.snippet(paths[2], 0, 9))
+            self.assertEqual(reader.maps, {})
+
+    def test_spans_follow_the_source_encoding(self):
+        latin_path = os.path.join(self.tmp_dir.name, "latin.py")
+        with open(latin_path, "wb") as f:
+            f.write("# -*- coding: latin-1 -*-\ndef café(): return 1\n".encode("latin-1"))
+        props = extract_file(latin_path).nodes[("Function", "café", latin_path)]
+        self.assertEqual(props["lineno"], 2)
+        self.assertNotIn("start_byte", props)
+
+        bom_path = os.path.join(self.tmp_dir.name, "bom.py")
+        with open(bom_path, "wb") as f:
+            f.write(b"\xef\xbb\xbfdef caf\xc3\xa9(): return 1\n")
+        index = ContextIndex([extract_file(bom_path)])
+        self.assertEqual(index.context_pack("café", hops=0)[0]["source"], "def café(): return 1")
+        index.reader.close()
+
+    def test_store_lookup_uses_labelled_start(self):
+        session = MagicMock()
+        session.run.return_value = iter([])
+        context_pack_from_store(session, "scale", hops=1, reader=self.index.reader)
+        self.assertIn("MATCH (start:Function|Class|Variable {qualname: $symbol})", session.run.call_args.args[0])
+
+        session = MagicMock()
+        ensure_context_indexes(session)
+        self.assertIn("CREATE INDEX function_qualname IF NOT EXISTS FOR (n:Function) ON (n.qualname)",
+                      [call.args[0] for call in session.run.call_args_list])
+
+    def test_neighbourhood_by_hops(self):
+        one_hop = {entry["qualname"] for entry in self.index.context_pack("Shape.area", hops=1)}
+        self.assertEqual(one_hop, {"Shape.area", "Shape", "scale"})
+
+        two_hops = {entry["qualname"]: entry for entry in self.index.context_pack("Shape.area", hops=2)}
+        self.assertIn("Square", two_hops)
+        self.assertIn("Shape.sides", two_hops)
+        self.assertEqual(two_hops["Square"]["distance"], 2)
+        self.assertEqual(two_hops["Square"]["source"], "class Square(Shape):\n    pass")
+
+    def test_unknown_symbol(self):
+        self.assertEqual(self.index.context_pack("missing", hops=3), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import ast
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from src.extraction import extract_facts, extract_file
+from src.graph_diff import SnapshotCache, diff_facts, apply_delta, read_snapshot_from_store
+from src.journal import list_segments
+from src.source_loader import SourceLoader
+
+MOCK_CODEBASE = os.path.join(os.path.dirname(__file__), "mock_codebase")
+
+
+class TestGraphDiff(unittest.TestCase):
+    def setUp(self):
+        self.file_path = "pkg/example.py"
+        self.old_code = (
+            "import os\n"
+            "class Base:\n"
+            "    def run(self):\n"
+            "        return helper()\n"
+            "def helper():\n"
+            "    return 1\n"
+        )
+
+    def extract(self, code: str):
+        return extract_facts(ast.parse(code), self.file_path)
+
+    def test_extract_mock_file(self):
+        facts = extract_file(os.path.join(MOCK_CODEBASE, "file1.py"))
+        file_key = ("File", facts.file_path, facts.file_path)
+
+        self.assertIn(("Class", "MyClass", facts.file_path), facts.nodes)
+        self.assertIn(("Function", "MyClass.say_hello", facts.file_path), facts.nodes)
+        self.assertIn(
+            (("Function", "main", facts.file_path), "BELONGS_TO", file_key), facts.edges
+        )
+        self.assertIn(
+            (file_key, "IMPORTS", ("Module", "module1.some_function", "")), facts.edges
+        )
+
+    def test_unchanged_file_has_empty_delta(self):
+        delta = diff_facts(self.extract(self.old_code), self.extract(self.old_code))
+        self.assertTrue(delta.is_empty())
+
+    def test_delta_only_contains_changes(self):
+        new_code = self.old_code.replace("def helper():\n    return 1\n", "def other():\n    return 2\n")
+        delta = diff_facts(self.extract(self.old_code), self.extract(new_code))
+
+        self.assertEqual(list(delta.added_nodes), [("Function", "other", self.file_path)])
+        self.assertEqual(delta.removed_nodes, [("Function", "helper", self.file_path)])
+        self.assertIn(
+            (("Function", "Base.run", self.file_path), "CALLS", ("Function", "helper", self.file_path)),
+            delta.removed_edges
+        )
+        self.assertNotIn(("Class", "Base", self.file_path), delta.changed_nodes)
+
+    def test_removed_import_keeps_shared_module(self):
+        delta = diff_facts(self.extract(self.old_code), self.extract(self.old_code.replace("import os\n", "")))
+
+        self.assertEqual(delta.removed_nodes, [])
+        self.assertEqual(len(delta.removed_edges), 1)
+
+    def test_apply_delta_batches_by_label(self):
+        session = MagicMock()
+        delta = diff_facts(None, self.extract(self.old_code))
+        statements = apply_delta(session, delta)
+
+        self.assertEqual(statements, session.run.call_count)
+        self.assertLess(statements, len(delta))
+
+    def stored_session(self, facts, node_extra: dict, file_extra: dict, edge_extra: set=frozenset()):
+        """
+        A session answering read_snapshot_from_store's queries from `facts`,
+        with extra derived properties and edges on the stored nodes.
+        """
+        file_key = ("File", self.file_path, self.file_path)
+        node_rows = []
+        for key, props in facts.nodes.items():
+            if key[2] != self.file_path or key == file_key:
+                continue
+            stored = {**props, "qualname": key[1], "file": key[2], **node_extra.get(key[0], {})}
+            edges = [(rel, dst) for src, rel, dst in facts.edges | edge_extra if src == key]
+            for rel, dst in edges or [(None, None)]:
+                node_rows.append({
+                    "labels": [key[0]], "props": stored, "rel": rel,
+                    "target_labels": [dst[0]] if dst else None,
+                    "target_props": {"qualname": dst[1], "file": dst[2], "path": dst[1]} if dst else None,
+                })
+        module_rows = [{"props": {**facts.nodes[dst], "name": dst[1]}} for src, rel, dst in facts.edges if rel == "IMPORTS"]
+
+        def run(query, **params):
+            result = MagicMock()
+            if query.startswith("MATCH (file:File {path: $file}) RETURN"):
+                result.single.return_value = {"props": {**facts.nodes[file_key], "path": self.file_path, **file_extra}}
+            elif "IMPORTS" in query:
+                result.__iter__.return_value = iter(module_rows)
+            else:
+                result.__iter__.return_value = iter([row for row in node_rows
+                                                     if query.startswith(f"MATCH (n:{row['labels'][0]} ")])
+            return result
+
+        session = MagicMock()
+        session.run.side_effect = run
+        return session
+
+    def test_derived_properties_do_not_show_up_as_changes(self):
+        facts = self.extract(self.old_code)
+        session = self.stored_session(
+            facts,
+            {"Function": {"fan_in": 1, "fan_out": 0},
+             "Class": {"class_id": "pkg.example.Base", "mro": ["pkg.example.Base"], "ancestors": [], "descendants": []}},
+            {"module": "pkg.example", "import_layer": 0, "import_cycle": None, "import_count": 0, "importer_count": 0}
+        )
+        delta = diff_facts(read_snapshot_from_store(session, self.file_path), facts)
+        self.assertTrue(delta.is_empty(), vars(delta))
+
+    def test_materialized_edges_are_not_read_back(self):
+        facts = self.extract(self.old_code)
+        base_key = ("Class", "Base", self.file_path)
+        session = self.stored_session(facts, {}, {}, {(base_key, "SUBCLASS_OF", ("Class", "Root", "pkg/root.py"))})
+        delta = diff_facts(read_snapshot_from_store(session, self.file_path), facts)
+        self.assertTrue(delta.is_empty(), vars(delta))
+
+    def test_edges_to_other_files_keep_their_target_file(self):
+        facts = self.extract(self.old_code)
+        run_key, util_key = ("Function", "Base.run", self.file_path), ("Function", "util", "pkg/util.py")
+        session = self.stored_session(facts, {}, {}, {(run_key, "CALLS", util_key)})
+        previous = read_snapshot_from_store(session, self.file_path)
+        self.assertIn((run_key, "CALLS", util_key), previous.edges)
+
+    def test_file_node_is_added_on_an_empty_store(self):
+        session = MagicMock()
+        session.run.return_value.single.return_value = None
+        session.run.return_value.__iter__.return_value = iter([])
+        previous = read_snapshot_from_store(session, self.file_path)
+        self.assertEqual(previous.nodes, {})
+
+        facts = self.extract("def f():\n    pass\n")
+        delta = diff_facts(previous, facts)
+        self.assertIn(("File", self.file_path, self.file_path), delta.added_nodes)
+
+    def test_snapshot_round_trip(self):
+        facts = self.extract(self.old_code)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SnapshotCache(cache_dir)
+            self.assertIsNone(cache.load(self.file_path))
+            cache.save(facts)
+            self.assertTrue(diff_facts(cache.load(self.file_path), facts).is_empty())
+
+
+class TestSyncCodebase(unittest.TestCase):
+    def test_deleted_files_are_removed(self):
+        from src.cb_parser3 import CodebaseParser
+        with tempfile.TemporaryDirectory() as tmp:
+            codebase = os.path.join(tmp, "code")
+            os.makedirs(codebase)
+            kept, deleted = os.path.join(codebase, "kept.py"), os.path.join(codebase, "deleted.py")
+            for file_path, code in ((kept, "def kept():\n    pass\n"), (deleted, "class Gone:\n    pass\n")):
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(code)
+            journal_dir = os.path.join(tmp, "journal")
+            with patch("neo4j.GraphDatabase.driver"):
+                parser = CodebaseParser("bolt://localhost:7687", "neo4j", "password",
+                                        snapshot_dir=os.path.join(tmp, "snapshots"), journal_dir=journal_dir)
+            parser.loader = SourceLoader(workers=1)
+            parser.sync_codebase(codebase)
+            os.remove(deleted)
+            parser.journal.close()
+            for _, path in list_segments(journal_dir):
+                os.remove(path)
+
+            self.assertGreater(parser.sync_codebase(codebase), 0)
+            parser.journal.close()
+            with open(list_segments(journal_dir)[0][1], encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+            deletes = [entry for entry in entries if "DETACH DELETE" in entry["q"]]
+            self.assertIn({"qualname": "Gone", "file": deleted}, [row for entry in deletes for row in entry["p"]["rows"]])
+            self.assertIn({"path": deleted}, [row for entry in deletes for row in entry["p"]["rows"]])
+            self.assertEqual(parser.snapshots.file_paths(), [kept])
+            self.assertEqual(parser.search_symbols("Gone"), [])
+            self.assertNotIn("deleted", parser.module_graph.files)
+
+
+if __name__ == "__main__":
+    unittest.main()
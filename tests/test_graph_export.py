@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from xml.etree import ElementTree
+from src.graph_export import GraphExporter, iter_facts_records, iter_store_records
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+MOCK_CODEBASE = os.path.join(os.path.dirname(__file__), "mock_codebase")
+
+
+class TestGraphExport(unittest.TestCase):
+    def setUp(self):
+        self.files = sorted(
+            os.path.join(MOCK_CODEBASE, name) for name in os.listdir(MOCK_CODEBASE) if name.endswith(".py")
+        )
+        self.records = list(iter_facts_records(self.files))
+
+    def test_jsonl_chunks_and_manifest(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            manifest = GraphExporter(output_dir, "jsonl", chunk_size=4).export(iter(self.records))
+
+            self.assertEqual(manifest["nodes"] + manifest["edges"], len(self.records))
+            exported = 0
+            for chunk in manifest["chunks"]:
+                self.assertLessEqual(chunk["records"], 4)
+                with open(os.path.join(output_dir, chunk["file"])) as f:
+                    lines = [json.loads(line) for line in f]
+                self.assertEqual(len(lines), chunk["records"])
+                exported += len(lines)
+            self.assertEqual(exported, len(self.records))
+
+            with open(os.path.join(output_dir, "manifest.json")) as f:
+                self.assertEqual(json.load(f), manifest)
+
+    def test_graphml_chunks_are_valid_documents(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            manifest = GraphExporter(output_dir, "graphml", chunk_size=5).export(iter(self.records))
+            for chunk in manifest["chunks"]:
+                root = ElementTree.parse(os.path.join(output_dir, chunk["file"])).getroot()
+                elements = root.findall(f".//{{http://graphml.graphdrawing.org/xmlns}}{chunk['kind']}")
+                self.assertEqual(len(elements), chunk["records"])
+
+    @unittest.skipUnless(pyarrow, "Parquet export requires pyarrow")
+    def test_parquet_chunks_round_trip(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            manifest = GraphExporter(output_dir, "parquet", chunk_size=5).export(iter(self.records))
+            exported = []
+            for chunk in manifest["chunks"]:
+                rows = pyarrow.parquet.read_table(os.path.join(output_dir, chunk["file"])).to_pylist()
+                self.assertEqual(len(rows), chunk["records"])
+                exported.extend(rows)
+            self.assertEqual(len(exported), len(self.records))
+            node = next(row for row in exported if row.get("labels"))
+            self.assertIsInstance(json.loads(node["props"]), dict)
+            self.assertIsInstance(json.loads(node["labels"]), list)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            GraphExporter(tempfile.gettempdir(), "csv")
+
+    def test_store_records_page_by_id(self):
+        session = MagicMock()
+        session.run.side_effect = [
+            [{"id": 1, "labels": ["File"], "props": {"path": "a.py"}},
+             {"id": 2, "labels": ["File"], "props": {"path": "b.py"}}],
+            [{"id": 3, "labels": ["File"], "props": {"path": "c.py"}}],
+            [],
+        ]
+        records = list(iter_store_records(session, page_size=2))
+
+        self.assertEqual([record["id"] for _, record in records], ["1", "2", "3"])
+        self.assertEqual(session.run.call_args_list[1].kwargs["last_id"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
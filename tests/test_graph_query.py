@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import MagicMock
+from src.graph_query import GraphQuery, decode_cursor, encode_cursor
+
+
+class FakeRecord:
+    def __init__(self, data):
+        self._data = data
+
+    def data(self):
+        return dict(self._data)
+
+
+class FakeDriver:
+    """
+    Serves CALLS rows by keyset, recording the id each page started after.
+    """
+
+    def __init__(self, row_count):
+        self.rows = [{"_cursor_id": i * 10, "caller": f"f{i}", "callee": "g"} for i in range(row_count)]
+        self.pages = []
+
+    def session(self, fetch_size=None):
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.run.side_effect = self.run
+        return session
+
+    def run(self, query, params=None, last_id=None, limit=None):
+        self.pages.append(last_id)
+        rows = [row for row in self.rows if row["_cursor_id"] > last_id][:limit]
+        return iter(FakeRecord(row) for row in rows)
+
+
+class TestGraphQuery(unittest.TestCase):
+    def test_pages_through_results_lazily(self):
+        driver = FakeDriver(5)
+        cursor = GraphQuery(driver).calls(page_size=2)
+        self.assertEqual(driver.pages, [])
+
+        records = list(cursor)
+        self.assertEqual([record["caller"] for record in records], ["f0", "f1", "f2", "f3", "f4"])
+        self.assertNotIn("_cursor_id", records[0])
+        self.assertEqual(driver.pages, [-1, 10, 30])
+
+    def test_resume_from_token(self):
+        driver = FakeDriver(5)
+        query = GraphQuery(driver)
+        cursor = query.calls(page_size=2)
+        iterator = iter(cursor)
+        next(iterator)
+        next(iterator)
+        next(iterator)
+        token = cursor.token
+        self.assertEqual(decode_cursor(token)["last_id"], 20)
+
+        remaining = [record["caller"] for record in query.resume(token)]
+        self.assertEqual(remaining, ["f3", "f4"])
+
+    def test_invalid_arguments(self):
+        query = GraphQuery(FakeDriver(0))
+        with self.assertRaises(ValueError):
+            query.resume("not-a-token")
+        with self.assertRaises(ValueError):
+            query.nodes("Function) DETACH DELETE (n")
+
+    def test_tokens_cannot_carry_queries(self):
+        query = GraphQuery(FakeDriver(0))
+        token = query.nodes("Function").token
+        self.assertNotIn("MATCH", str(decode_cursor(token)))
+        self.assertEqual(query.resume(token).query, query.nodes("Function").query)
+
+        forged = [
+            {"template": "MATCH (n) DETACH DELETE n", "args": {}},
+            {"template": "nodes", "args": {"label": "Function) DETACH DELETE (n"}},
+            {"template": "nodes", "args": {}},
+        ]
+        for state in forged:
+            with self.assertRaises(ValueError):
+                query.resume(encode_cursor({**state, "params": {}, "last_id": -1, "page_size": 10}))
+        with self.assertRaises(ValueError):
+            query.paginate("MATCH (n) RETURN id(n) AS _cursor_id").token
+
+
+if __name__ == "__main__":
+    unittest.main()
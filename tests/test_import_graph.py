@@ -0,0 +1,82 @@
+import ast
+import unittest
+from unittest.mock import MagicMock
+from src.class_hierarchy import module_name_for
+from src.extraction import extract_facts
+from src.import_graph import ModuleGraph
+
+MODULES = {
+    "pkg/__init__.py": "from .api import serve\n",
+    "pkg/api.py": "import os\nfrom pkg import models\nfrom .util import helper\n",
+    "pkg/models.py": "from pkg.util import helper\nimport pkg.api\n",
+    "pkg/util.py": "import typing\n",
+    "app.py": "from pkg.api import serve\n",
+}
+
+
+class TestModuleGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = ModuleGraph()
+        for file_path, code in MODULES.items():
+            self.update(file_path, code)
+
+    def update(self, file_path: str, code: str) -> None:
+        module_name, is_package = module_name_for(file_path)
+        self.graph.update_file(extract_facts(ast.parse(code), file_path), module_name, is_package)
+
+    def test_resolves_internal_and_external_imports(self):
+        self.assertEqual(self.graph.imports["pkg.api"], {"pkg.models", "pkg.util"})
+        self.assertEqual(self.graph.imports["pkg"], {"pkg.api"})
+        self.assertEqual(self.graph.external["pkg.api"], {"os"})
+
+    def test_cycles(self):
+        self.assertEqual(self.graph.cycles(), [["pkg.api", "pkg.models"]])
+
+    def test_layers(self):
+        self.assertEqual(self.graph.layers(), [["pkg.util"], ["pkg.api", "pkg.models"], ["app", "pkg"]])
+
+    def test_reverse_dependencies(self):
+        self.assertEqual(self.graph.affected_by("pkg.util"), {"pkg.api", "pkg.models", "pkg", "app"})
+        self.assertEqual(self.graph.affected_by("app"), set())
+        self.assertEqual(self.graph.dependencies("app"), {"pkg.api", "pkg.models", "pkg.util"})
+
+    def test_incremental_updates(self):
+        self.update("pkg/models.py", "from pkg.util import helper\n")
+        self.assertEqual(self.graph.cycles(), [])
+
+        # A module added later picks up imports that were previously external
+        self.update("late.py", "import pkg.extra\n")
+        self.assertEqual(self.graph.imports["late"], {"pkg"})
+        self.update("pkg/extra.py", "")
+        self.assertEqual(self.graph.imports["late"], {"pkg.extra"})
+
+        self.graph.remove_module("pkg.extra")
+        self.assertEqual(self.graph.imports["late"], {"pkg"})
+
+    def test_layer_violations(self):
+        self.assertEqual(self.graph.layer_violations(["pkg.util", "pkg.models", "pkg.api"]),
+                         [("pkg.models", "pkg.api")])
+
+    def test_persist(self):
+        session = MagicMock()
+        self.graph.persist(session)
+        rows = {row["module"]: row for row in session.run.call_args.kwargs["rows"]}
+        self.assertEqual(rows["pkg.api"]["cycle"], rows["pkg.models"]["cycle"])
+        self.assertIsNone(rows["app"]["cycle"])
+        self.assertEqual(rows["pkg.util"]["layer"], 0)
+        self.assertEqual(rows["pkg.util"]["importers"], 2)
+
+
+    def test_persist_only_sends_changed_modules(self):
+        session = MagicMock()
+        self.assertEqual(self.graph.persist(session), len(MODULES))
+        self.assertEqual(self.graph.persist(session), 0)
+        self.assertEqual(session.run.call_count, 1)
+
+        self.update("app.py", "from pkg.api import serve\nimport pkg.util\n")
+        self.graph.persist(session)
+        rows = session.run.call_args.kwargs["rows"]
+        self.assertEqual(sorted(row["module"] for row in rows), ["app", "pkg.util"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from src.journal import WriteJournal, JournalReplayer, batch_query, list_segments
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.journal_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def replay(self):
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        stats = JournalReplayer(self.journal_dir, batch_size=2).replay(driver)
+        return stats, session.run.call_args_list
+
+    def test_reads_are_not_journaled(self):
+        journal = WriteJournal(self.journal_dir)
+        with journal.session() as session:
+            self.assertIsNone(session.run("MATCH (n) RETURN n").single())
+        journal.close()
+        self.assertEqual(list_segments(self.journal_dir), [])
+
+    def test_segments_rotate_and_open_segment_is_not_replayed(self):
+        journal = WriteJournal(self.journal_dir, segment_size=100)
+        for i in range(4):
+            journal.run("MERGE (file:File {path: $path})", path=f"file_{i}.py")
+        sealed = list_segments(self.journal_dir)
+        self.assertGreater(len(sealed), 1)
+
+        journal.run("MERGE (file:File {path: $path})", path="still_open.py")
+        stats, calls = self.replay()
+        self.assertEqual(stats["journaled"], 4)
+        self.assertEqual(list_segments(self.journal_dir), [])
+
+        # A new writer seals the segment its predecessor left open
+        WriteJournal(self.journal_dir)
+        stats, calls = self.replay()
+        self.assertEqual(calls[0].kwargs["batch"], [{"path": "still_open.py"}])
+
+    def test_replay_coalesces_and_batches(self):
+        journal = WriteJournal(self.journal_dir)
+        merge_file = "MERGE (file:File {path: $path})"
+        merge_edge = "MATCH (f:File {path: $path}), (m:Module {name: $name}) MERGE (f)-[:IMPORTS]->(m)"
+        journal.run(merge_file, path="a.py")
+        journal.run(merge_edge, path="a.py", name="os")
+        journal.run(merge_file, path="b.py")
+        journal.run(merge_file, path="a.py")
+        journal.run(merge_file, path="c.py")
+        journal.run("MATCH (f:File {path: $path}) DETACH DELETE f", path="a.py")
+        journal.run(merge_file, path="a.py")
+        journal.close()
+
+        stats, calls = self.replay()
+        self.assertEqual(stats["journaled"], 7)
+        self.assertEqual(stats["coalesced"], 1)
+        self.assertEqual(
+            [(call.args[0], call.kwargs["batch"]) for call in calls],
+            [
+                (batch_query(merge_file), [{"path": "a.py"}]),
+                (batch_query(merge_edge), [{"path": "a.py", "name": "os"}]),
+                (batch_query(merge_file), [{"path": "b.py"}, {"path": "c.py"}]),
+                (batch_query("MATCH (f:File {path: $path}) DETACH DELETE f"), [{"path": "a.py"}]),
+                (batch_query(merge_file), [{"path": "a.py"}]),
+            ]
+        )
+
+    def test_replay_keeps_dependent_writes_in_order(self):
+        journal = WriteJournal(self.journal_dir)
+        merge_node = "MERGE (n:Function {qualname: $qualname})"
+        merge_edge = ("MATCH (a:Function {qualname: $src}), (b:Function {qualname: $dst}) "
+                      "MERGE (a)-[:CALLS]->(b)")
+        journal.run(merge_edge, src="old1", dst="old2")
+        journal.run(merge_node, qualname="new1")
+        journal.run(merge_node, qualname="new2")
+        journal.run(merge_edge, src="new1", dst="new2")
+        journal.close()
+
+        stats, calls = self.replay()
+        self.assertEqual(
+            [(call.args[0], call.kwargs["batch"]) for call in calls],
+            [
+                (batch_query(merge_edge), [{"src": "old1", "dst": "old2"}]),
+                (batch_query(merge_node), [{"qualname": "new1"}, {"qualname": "new2"}]),
+                (batch_query(merge_edge), [{"src": "new1", "dst": "new2"}]),
+            ]
+        )
+
+    def test_repeated_match_merges_are_not_coalesced(self):
+        journal = WriteJournal(self.journal_dir)
+        merge_node = "MERGE (n:Function {qualname: $qualname})"
+        merge_edge = ("MATCH (a:Function {qualname: $src}), (b:Function {qualname: $dst}) "
+                      "MERGE (a)-[:CALLS]->(b)")
+        # The first edge write matches nothing until helper exists
+        journal.run(merge_edge, src="A.run", dst="helper")
+        journal.run(merge_node, qualname="helper")
+        journal.run(merge_edge, src="A.run", dst="helper")
+        journal.close()
+
+        stats, calls = self.replay()
+        self.assertEqual(stats["coalesced"], 0)
+        self.assertEqual([call.args[0] for call in calls][-1], batch_query(merge_edge))
+
+    def test_schema_statements_are_refused(self):
+        journal = WriteJournal(self.journal_dir)
+        with self.assertRaises(ValueError):
+            journal.run("CREATE INDEX function_qualname IF NOT EXISTS FOR (n:Function) ON (n.qualname)")
+        journal.close()
+        self.assertEqual(list_segments(self.journal_dir), [])
+
+    def test_batch_query_rewrites_parameters(self):
+        self.assertEqual(
+            batch_query("MERGE (n:File {path: $path})"),
+            "UNWIND $batch AS _journal_row MERGE (n:File {path: _journal_row.path})"
+        )
+
+    def test_torn_final_line_is_skipped(self):
+        journal = WriteJournal(self.journal_dir)
+        journal.run("MERGE (file:File {path: $path})", path="a.py")
+        journal.close()
+        with open(list_segments(self.journal_dir)[0][1], "a") as f:
+            f.write('{"q": "MERGE')
+        stats, calls = self.replay()
+        self.assertEqual(stats["journaled"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import ast
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.extraction import extract_facts
+from src.source_loader import SourceLoader
+
+CODE = '''
+class Account:
+    kind = "basic"
+
+    def __init__(self, owner, *args, balance=0, **kwargs):
+        self.owner = owner
+        self.balance = balance
+
+    def withdraw(self, amount):
+        if amount > self.balance and not self.overdraft:
+            raise ValueError("insufficient funds")
+        for fee in self.fees():
+            while fee:
+                fee -= 1
+        return [x for x in range(3) if x]
+
+    def fees(self):
+        return []
+
+def helper():
+    def inner():
+        if True:
+            pass
+    return inner()
+'''
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.file_path = "bank.py"
+        self.facts = extract_facts(ast.parse(CODE), self.file_path)
+
+    def node(self, label: str, qualname: str) -> dict:
+        return self.facts.nodes[(label, qualname, self.file_path)]
+
+    def test_function_metrics(self):
+        withdraw = self.node("Function", "Account.withdraw")
+        # if + and + for + while + comprehension + comprehension if
+        self.assertEqual(withdraw["complexity"], 7)
+        self.assertEqual(withdraw["nesting_depth"], 2)
+        self.assertEqual(withdraw["param_count"], 2)
+        self.assertEqual(withdraw["loc"], 7)
+
+        self.assertEqual(self.node("Function", "Account.__init__")["param_count"], 5)
+
+    def test_nested_functions_are_measured_separately(self):
+        self.assertEqual(self.node("Function", "helper")["complexity"], 1)
+        self.assertEqual(self.node("Function", "helper")["nesting_depth"], 0)
+        self.assertEqual(self.node("Function", "helper.inner")["complexity"], 2)
+
+    def test_class_metrics(self):
+        account = self.node("Class", "Account")
+        self.assertEqual(account["method_count"], 3)
+        self.assertEqual(account["attribute_count"], 3)
+
+    def test_elif_chain_does_not_nest(self):
+        code = (
+            "def classify(x):\n"
+            "    if x < 0:\n        return -1\n"
+            "    elif x == 0:\n        return 0\n"
+            "    elif x < 10:\n        return 1\n"
+            "    elif x < 100:\n        return 2\n"
+            "    else:\n"
+            "        if x < 1000:\n            return 3\n"
+            "    return 4\n"
+        )
+        props = extract_facts(ast.parse(code), "classify.py").nodes[("Function", "classify", "classify.py")]
+        self.assertEqual(props["nesting_depth"], 2)
+        self.assertEqual(props["complexity"], 6)
+
+
+class TestMetricIndexes(unittest.TestCase):
+    def test_sync_codebase_creates_metric_indexes(self):
+        from src.cb_parser3 import CodebaseParser
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "bank.py"), "w", encoding="utf-8") as f:
+                f.write(CODE)
+            with patch("neo4j.GraphDatabase.driver") as driver:
+                parser = CodebaseParser("bolt://localhost:7687", "neo4j", "password")
+            parser.loader = SourceLoader(workers=1)
+            parser.sync_codebase(tmp)
+        session = driver.return_value.session.return_value.__enter__.return_value
+        queries = [call.args[0] for call in session.run.call_args_list]
+        self.assertIn("CREATE INDEX function_complexity IF NOT EXISTS FOR (n:Function) ON (n.complexity)", queries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import ast
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src.extraction import extract_facts
+from src.parallel_writer import ParallelGraphWriter
+from src.source_loader import SourceLoader
+
+
+class RecordingDriver:
+    """
+    Records, per session, the rows written by each statement.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.phases = []
+
+    def session(self):
+        session = MagicMock()
+        session.__enter__.return_value = session
+        calls = []
+        session.run.side_effect = lambda query, **params: calls.append((query, params))
+        session.execute_write.side_effect = lambda func, *args: func(session, *args)
+        with self.lock:
+            self.phases.append(calls)
+        return session
+
+
+class TestParallelGraphWriter(unittest.TestCase):
+    def setUp(self):
+        self.facts_list = [
+            extract_facts(ast.parse(f"import os\nimport typing\ndef f{i}():\n    return f{i}()\n"), f"pkg/m{i}.py")
+            for i in range(10)
+        ]
+
+    def test_phases_partition_nodes(self):
+        driver = RecordingDriver()
+        counts = ParallelGraphWriter(driver, writers=3, files_per_batch=2).write(self.facts_list)
+
+        shared_phase, *owned_phases, edge_phase = driver.phases
+        self.assertEqual(len(owned_phases), 5)
+        self.assertEqual(counts["shared_nodes"], 3)
+        self.assertEqual(counts["shared_edges"], 30)
+
+        # Shared nodes are created exactly once, in the first phase
+        shared_rows = [row["id"] for _, params in shared_phase for row in params["rows"]]
+        self.assertEqual(sorted(map(str, shared_rows)),
+                         sorted(map(str, [{"path": "pkg"}, {"name": "os"}, {"name": "typing"}])))
+
+        # Writers never touch the same node and never touch shared nodes
+        touched = {}
+        for index, phase in enumerate(owned_phases):
+            for query, params in phase:
+                self.assertNotIn("Module", query)
+                self.assertNotIn("Directory", query)
+                for row in params["rows"]:
+                    for node in (row.get("id"), row.get("src"), row.get("dst")):
+                        if node is not None:
+                            key = str(sorted(node.items()))
+                            self.assertEqual(touched.setdefault(key, index), index)
+
+        edge_queries = " ".join(query for query, _ in edge_phase)
+        self.assertIn("IMPORTS", edge_queries)
+        self.assertIn("CONTAINS", edge_queries)
+
+
+class TestParallelIndex(unittest.TestCase):
+    def test_parallel_index_fills_and_saves_the_symbol_index(self):
+        from src.cb_parser3 import CodebaseParser
+        with tempfile.TemporaryDirectory() as tmp:
+            codebase = os.path.join(tmp, "code")
+            os.makedirs(codebase)
+            with open(os.path.join(codebase, "shapes.py"), "w", encoding="utf-8") as f:
+                f.write("def area():\n    return 1\n")
+            snapshot_dir = os.path.join(tmp, "snapshots")
+            os.makedirs(snapshot_dir)
+            with patch("neo4j.GraphDatabase.driver", return_value=RecordingDriver()):
+                parser = CodebaseParser("bolt://localhost:7687", "neo4j", "password", snapshot_dir=snapshot_dir)
+            parser.loader = SourceLoader(workers=1)
+            parser.parallel_index(codebase, writers=1)
+
+            self.assertEqual([r["qualname"] for r in parser.search_symbols("area")], ["area"])
+            self.assertTrue(os.path.isfile(parser.symbol_index_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+from src.profiling import IngestProfiler, NullProfiler
+
+
+def slow_work():
+    time.sleep(0.05)
+    return [bytearray(1024 * 1024)]
+
+
+class TestProfiling(unittest.TestCase):
+    def test_attributes_cost_to_files_and_queries(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler = IngestProfiler(output_dir, top_n=1, sample_interval=0.001)
+            session = profiler.wrap_session(MagicMock())
+            with profiler.run():
+                with profiler.file("fast.py"):
+                    session.run("MERGE (file:File {path: $path})", path="fast.py")
+                with profiler.file("slow.py"):
+                    with profiler.stage("parse"):
+                        slow_work()
+                    session.run("MERGE   (file:File\n {path: $path})", path="slow.py")
+            report_path = profiler.write_report()
+
+            slow = profiler.files["slow.py"]
+            self.assertGreaterEqual(slow["stages"]["parse"], 0.05)
+            self.assertGreaterEqual(slow["peak_memory"], 1024 * 1024)
+            self.assertEqual(slow["queries"], 1)
+            self.assertEqual(profiler.slowest_files()[0][0], "slow.py")
+            # Whitespace differences collapse into one query template
+            self.assertEqual(list(profiler.queries.values())[0]["calls"], 2)
+
+            with open(report_path) as f:
+                report = f.read()
+            self.assertIn("slow.py", report)
+            self.assertNotIn("fast.py", report)
+            with open(os.path.join(output_dir, "stacks.collapsed")) as f:
+                self.assertIn("slow_work", f.read())
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "ingest.prof")))
+
+    def test_null_profiler_is_transparent(self):
+        profiler = NullProfiler()
+        session = MagicMock()
+        self.assertIs(profiler.wrap_session(session), session)
+        with profiler.file("a.py"), profiler.stage("parse"):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
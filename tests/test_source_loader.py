@@ -0,0 +1,90 @@
+import os
+import tempfile
+import time
+import unittest
+from src.source_loader import SourceLoader, SourceError, load_facts
+
+
+def file_status(facts):
+    return facts.nodes[("File", facts.file_path, facts.file_path)].get("load_status")
+
+
+class TestSourceLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, data: bytes) -> str:
+        file_path = os.path.join(self.tmp.name, name)
+        with open(file_path, 'wb') as f:
+            f.write(data)
+        return file_path
+
+    def test_honours_encoding_cookie(self):
+        file_path = self.write("latin.py", "# -*- coding: latin-1 -*-\ndef café():\n    pass\n".encode("latin-1"))
+        facts = load_facts(file_path)
+        self.assertIsNone(file_status(facts))
+        self.assertIn(("Function", "café", file_path), facts.nodes)
+
+    def test_undecodable_and_broken_files_are_annotated(self):
+        undecodable = load_facts(self.write("bad.py", "name = 'café'\n".encode("latin-1")))
+        self.assertEqual(file_status(undecodable), "failed")
+        self.assertIn("encoding", undecodable.nodes[("File", undecodable.file_path, undecodable.file_path)]["load_error"])
+
+        broken = load_facts(self.write("broken.py", b"def broken(:\n"))
+        self.assertEqual(file_status(broken), "failed")
+        self.assertEqual(len(broken.nodes), 1)
+
+    def test_size_and_line_limits(self):
+        loader = SourceLoader(max_bytes=100, max_lines=3)
+        with self.assertRaises(SourceError) as context:
+            loader.read_and_parse(self.write("big.py", b"x = 1\n" * 50))
+        self.assertEqual(context.exception.status, "skipped")
+        source, tree = loader.read_and_parse(self.write("small.py", b"x = 1\n"))
+        # Trees are parsed in-process rather than pickled back from a worker
+        self.assertIsNone(loader.worker)
+        self.assertEqual((source, len(tree.body)), (b"x = 1\n", 1))
+        self.assertEqual(file_status(loader.load(self.write("long.py", b"x\n" * 5))), "skipped")
+        self.assertIsNone(file_status(loader.load(self.write("ok.py", b"x = 1\n"))))
+        loader.close()
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "needs named pipes")
+    def test_load_many_times_out_stuck_files(self):
+        good = self.write("good.py", b"def good():\n    pass\n")
+        broken = self.write("broken.py", b"def broken(:\n")
+        # Opening a FIFO with no writer blocks the worker forever
+        stuck = os.path.join(self.tmp.name, "stuck.py")
+        os.mkfifo(stuck)
+
+        start = time.monotonic()
+        results = {facts.file_path: facts for facts in SourceLoader(timeout=1.0, workers=2).load_many([stuck, good, broken])}
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(file_status(results[stuck]), "timeout")
+        self.assertEqual(file_status(results[broken]), "failed")
+        self.assertIn(("Function", "good", good), results[good].nodes)
+
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "needs named pipes")
+    def test_single_file_requests_time_out(self):
+        stuck = os.path.join(self.tmp.name, "stuck.py")
+        os.mkfifo(stuck)
+        good = self.write("good.py", b"def good():\n    pass\n")
+        loader = SourceLoader(timeout=1.0)
+        try:
+            # In-process parses never open special files
+            with self.assertRaises(SourceError) as context:
+                loader.read_and_parse(stuck)
+            self.assertEqual(context.exception.status, "skipped")
+            self.assertEqual(file_status(loader.load(stuck)), "timeout")
+            # A fresh worker serves the next request
+            source, tree = loader.read_and_parse(good)
+            self.assertEqual(tree.body[0].name, "good")
+            self.assertIn(("Function", "good", good), loader.load(good).nodes)
+        finally:
+            loader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
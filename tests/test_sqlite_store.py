@@ -0,0 +1,89 @@
+import ast
+import os
+import tempfile
+import unittest
+from src.extraction import extract_facts
+from src.sqlite_store import SQLiteGraphStore
+
+SERVICE = """
+import os.path
+from pkg import util
+
+def load():
+    return parse()
+
+def parse():
+    return tokenize()
+
+def tokenize():
+    return []
+
+class Service:
+    def start(self):
+        return self.run()
+
+    def run(self):
+        return load()
+"""
+
+CLIENT = "import pkg.util\nfrom pkg.util import helper\n\ndef main():\n    return helper()\n"
+
+
+class TestSQLiteGraphStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SQLiteGraphStore(os.path.join(self.tmp.name, "graph.db"))
+        self.store.load([
+            extract_facts(ast.parse(SERVICE), "service.py"),
+            extract_facts(ast.parse(CLIENT), "client.py"),
+        ])
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_uses_wal_mode(self):
+        mode = self.store.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_callees(self):
+        direct = [entry["qualname"] for entry in self.store.callees("load")]
+        self.assertEqual(direct, ["parse"])
+        transitive = [(entry["qualname"], entry["depth"]) for entry in self.store.callees("load", depth=5)]
+        self.assertEqual(transitive, [("parse", 1), ("tokenize", 2)])
+
+    def test_callers(self):
+        callers = [(entry["qualname"], entry["depth"]) for entry in self.store.callers("parse", depth=3)]
+        self.assertEqual(callers, [("load", 1), ("Service.run", 2), ("Service.start", 3)])
+        self.assertEqual(self.store.callers("Service.run")[0]["lineno"], 15)
+
+    def test_importers(self):
+        self.assertEqual(self.store.importers("pkg"), ["client.py", "service.py"])
+        self.assertEqual(self.store.importers("pkg.util"), ["client.py", "service.py"])
+        self.assertEqual(self.store.importers("pkg.util.helper"), ["client.py"])
+        self.assertEqual(self.store.importers("os"), ["service.py"])
+
+    def test_replace_file_is_incremental(self):
+        before = self.store.counts()
+        self.store.replace_file(extract_facts(ast.parse(SERVICE), "service.py"))
+        self.assertEqual(self.store.counts(), before)
+
+        self.store.replace_file(extract_facts(ast.parse("def load():\n    return 1\n"), "service.py"))
+        self.assertEqual(self.store.callees("load"), [])
+        self.assertEqual(self.store.find("parse"), [])
+        self.assertEqual(self.store.importers("pkg"), ["client.py"])
+
+    def test_remove_file_and_orphans(self):
+        self.store.remove_file("service.py")
+        self.assertEqual(self.store.find("Service"), [])
+        self.assertEqual(self.store.remove_orphan_shared_nodes(), 1)
+        self.assertEqual([entry["qualname"] for entry in self.store.find("pkg.util")], ["pkg.util"])
+
+    def test_persists_across_connections(self):
+        self.store.close()
+        self.store = SQLiteGraphStore(os.path.join(self.tmp.name, "graph.db"))
+        self.assertEqual([entry["file"] for entry in self.store.find("main", label="Function")], ["client.py"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import ast
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.extraction import extract_facts
+from src.symbol_index import SymbolIndex, MAX_FUZZY_CANDIDATES
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SymbolIndex()
+        self.index.update_file(self.extract("a.py", (
+            "class GraphBuilder:\n"
+            "    def build_graph(self):\n"
+            "        pass\n"
+            "def parse_file():\n"
+            "    pass\n"
+            "def parse_codebase():\n"
+            "    pass\n"
+        )))
+        self.index.update_file(self.extract("b.py", "graph_store = None\n"))
+
+    def extract(self, file_path: str, code: str):
+        return extract_facts(ast.parse(code), file_path)
+
+    def test_prefix_search(self):
+        names = [result["qualname"] for result in self.index.search("parse_")]
+        self.assertEqual(sorted(names), ["parse_codebase", "parse_file"])
+        self.assertEqual(self.index.search("parse_file")[0]["score"], 1.0)
+
+    def test_qualified_prefix_search(self):
+        results = self.index.search("GraphBuilder.b")
+        self.assertEqual(results[0]["qualname"], "GraphBuilder.build_graph")
+
+    def test_fuzzy_search(self):
+        results = self.index.search("bulid_graph")
+        self.assertEqual(results[0]["qualname"], "GraphBuilder.build_graph")
+        self.assertLess(results[0]["score"], 0.5)
+
+    def test_fuzzy_search_is_bounded(self):
+        for i in range(3000):
+            self.index.add_symbol("Function", f"get_value_{i}", f"get_value_{i}", "many.py")
+        with patch.object(self.index, "fuzzy_matches", wraps=self.index.fuzzy_matches) as fuzzy:
+            self.assertEqual(len(self.index.search("get_value_1", limit=5)), 5)
+            # Prefix matches fill the page, so fuzzy matching is skipped
+            fuzzy.assert_not_called()
+        self.assertLessEqual(len(self.index.fuzzy_matches("get_valeu")), MAX_FUZZY_CANDIDATES)
+        self.assertEqual(self.index.search("bulid_graph")[0]["qualname"], "GraphBuilder.build_graph")
+
+    def test_incremental_update(self):
+        self.index.update_file(self.extract("a.py", "def parse_file():\n    pass\n"))
+        self.assertEqual([r["qualname"] for r in self.index.search("parse_")], ["parse_file"])
+        self.assertEqual(self.index.search("graph_s")[0]["file"], "b.py")
+        self.index.remove_file("b.py")
+        self.assertEqual(self.index.search("graph_s"), [])
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "symbols.json")
+            self.index.save(path)
+            loaded = SymbolIndex.load(path)
+        self.assertEqual(len(loaded), len(self.index))
+        self.assertEqual(loaded.search("graph_s"), self.index.search("graph_s"))
+
+
+if __name__ == "__main__":
+    unittest.main()